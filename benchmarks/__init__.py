@@ -0,0 +1,46 @@
+# SPDX-License-Identifier: MIT
+
+import time
+
+from typing import Any, Callable, Dict, List, Optional
+
+
+def measure(func: Callable[[], Any], number: int = 1, repeat: int = 5) -> List[float]:
+    '''
+    Measures the time of a callable
+
+    Returns the time per call (seconds) of each repetition.
+
+    :param func:    Callable to measure
+    :param number:  Calls per repetition
+    :param repeat:  Number of repetitions
+    '''
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        for j in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return times
+
+
+def result(value: Optional[float], unit: str, higher_is_better: bool = True, **extra: Any) -> Dict[str, Any]:
+    '''
+    Creates a benchmark result
+
+    :param value:               Result value, None if it couldn't be measured
+    :param unit:                Unit of the value
+    :param higher_is_better:    Whether a higher value is an improvement
+    '''
+    return dict(value=value, unit=unit, higher_is_better=higher_is_better, **extra)
+
+
+def throughput(times: List[float], items: int, unit: str) -> Dict[str, Any]:
+    '''
+    Creates a throughput result from the best repetition
+
+    :param times:   Time per call of each repetition
+    :param items:   Items processed per call
+    :param unit:    Unit of the items
+    '''
+    return result(items / min(times), f'{unit}/s', best=min(times), mean=sum(times) / len(times))
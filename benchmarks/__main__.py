@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: MIT
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+
+from typing import Any, Dict, List, Optional
+
+
+TIERS = ['kernel-free', 'uhid']
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    '''
+    Compares results against a baseline
+
+    Returns the benchmarks which regressed more than the threshold.
+
+    :param results:     Results
+    :param baseline:    Baseline results
+    :param threshold:   Tolerated regression (ratio)
+    '''
+    regressions = []
+    for name, res in results.items():
+        if name not in baseline or not baseline[name]['value'] or res['value'] is None:
+            continue
+        ratio = res['value'] / baseline[name]['value']
+        if not res['higher_is_better']:
+            ratio = 1 / ratio if ratio else float('inf')
+        print(f'{name:40} {ratio:6.2f}x')
+        if ratio < 1 - threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Run the ratbag-emu benchmarks')
+    parser.add_argument('--tier', choices=TIERS + ['all'], default='kernel-free',
+                        help='benchmarks to run, the uhid tier needs access to /dev/uhid')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='repetitions of each benchmark, the best one is used')
+    parser.add_argument('--output', type=str,
+                        help='save the results to this JSON file')
+    parser.add_argument('--compare', type=str,
+                        help='compare the results against this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='tolerated regression when comparing (ratio)')
+    options = parser.parse_args(args)
+
+    results: Dict[str, Any] = {}
+    if options.tier in ('kernel-free', 'all'):
+        from benchmarks import kernel_free
+        results.update(kernel_free.run(options.repeat))
+    if options.tier in ('uhid', 'all'):
+        from benchmarks import uhid
+        results.update(uhid.run(options.repeat))
+
+    for name, res in results.items():
+        value = 'n/a' if res['value'] is None else f'{res["value"]:.6g}'
+        print(f'{name:40} {value:>14} {res["unit"]}')
+
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump({
+                'meta': {
+                    'date': datetime.datetime.now().isoformat(),
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'machine': platform.machine(),
+                    'tier': options.tier,
+                },
+                'results': results,
+            }, f, indent=4)
+
+    if options.compare:
+        with open(options.compare) as f:
+            baseline = json.load(f)['results']
+        print()
+        regressions = compare(results, baseline, options.threshold)
+        if regressions:
+            print(f'regressions: {", ".join(regressions)}')
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
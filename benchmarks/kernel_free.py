@@ -0,0 +1,100 @@
+# SPDX-License-Identifier: MIT
+'''
+Benchmarks which don't need uhid
+
+Measures the throughput of the action planner, actuators and report
+encoders.
+'''
+
+from typing import Any, Dict, Optional
+
+import hidtools.hid
+
+from ratbag_emu import Device
+from ratbag_emu.actuators import SensorActuator
+from ratbag_emu.encoder import ReportEncoder
+from ratbag_emu.motion import MotionProfile
+from ratbag_emu.soak import GENERIC_MOUSE_RDESC
+from ratbag_emu.util import ActionType, EventData
+
+from benchmarks import measure, result, throughput
+
+
+REPORT_RATES = [125, 250, 500, 1000, 2000, 4000, 8000]
+LENGTHS = [1, 10, 100]  # mm
+DURATION = 500  # ms
+
+
+def _planner(rate: int) -> Device:
+    # A device without report descriptors has no endpoints, so no uhid
+    device = Device('ratbag-emu benchmark', (0x03, 0x9999, 0x9999), [])
+    device.report_rate = rate
+    device.actuators = [SensorActuator(dpi=1000)]
+    return device
+
+
+def _action(length: float, profile: Optional[MotionProfile] = None) -> Dict[str, Any]:
+    return {
+        'type': ActionType.XY,
+        'duration': DURATION,
+        'data': {
+            'x': length,
+            'y': length / 2,
+        },
+        'profile': profile,
+    }
+
+
+def bench_plan(results: Dict[str, Any], repeat: int) -> None:
+    for rate in REPORT_RATES:
+        device = _planner(rate)
+        for length in LENGTHS:
+            action = _action(length)
+            reports = len(device.plan_action(action))
+            times = measure(lambda: device.plan_action(action), number=20, repeat=repeat)
+            results[f'plan/linear/{rate}Hz/{length}mm'] = throughput(times, reports, 'reports')
+
+        action = _action(10, MotionProfile('ease-in-out', [(0.25, 0.5), (0.75, -0.5)], jitter=0.5, seed=0))
+        reports = len(device.plan_action(action))
+        times = measure(lambda: device.plan_action(action), number=20, repeat=repeat)
+        results[f'plan/curved/{rate}Hz/10mm'] = throughput(times, reports, 'reports')
+
+        device.destroy()
+
+
+def bench_actuators(results: Dict[str, Any], repeat: int) -> None:
+    actuator = SensorActuator(dpi=1000)
+    device = _planner(1000)
+    data = {'x': 5, 'y': 3}
+
+    times = measure(lambda: actuator.transform(data), number=10000, repeat=repeat)
+    results['actuator/sensor'] = throughput(times, 1, 'actions')
+
+    times = measure(lambda: device.transform_action(data), number=10000, repeat=repeat)
+    results['device/transform_action'] = throughput(times, 1, 'actions')
+
+    device.destroy()
+
+
+def bench_encoders(results: Dict[str, Any], repeat: int) -> None:
+    times = measure(lambda: hidtools.hid.ReportDescriptor.from_bytes(GENERIC_MOUSE_RDESC), number=100, repeat=repeat)
+    results['rdesc/parse'] = result(min(times), 's', higher_is_better=False)
+
+    rdesc = hidtools.hid.ReportDescriptor.from_bytes(GENERIC_MOUSE_RDESC)
+    encoder = ReportEncoder.compile(rdesc)
+    assert encoder
+    data = EventData(x=5, y=-3)
+
+    times = measure(lambda: rdesc.create_report(data), number=10000, repeat=repeat)
+    results['encode/hidtools'] = throughput(times, 1, 'reports')
+
+    times = measure(lambda: encoder.encode(data), number=10000, repeat=repeat)
+    results['encode/precompiled'] = throughput(times, 1, 'reports')
+
+
+def run(repeat: int = 5) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    bench_plan(results, repeat)
+    bench_actuators(results, repeat)
+    bench_encoders(results, repeat)
+    return results
@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: MIT
+'''
+Benchmarks which need uhid
+
+Measures the end-to-end report throughput and the uhid -> evdev latency.
+Needs access to /dev/uhid and the event nodes, which usually means root.
+The throughput benchmarks are repeated, keeping the best repetition.
+'''
+
+import os
+import select
+import time
+
+from typing import Any, Dict, List
+
+from ratbag_emu import Device
+from ratbag_emu.actuators import SensorActuator
+from ratbag_emu.flood import EVENT_SIZE, EvdevDrain
+from ratbag_emu.soak import GENERIC_MOUSE_RDESC
+from ratbag_emu.util import ActionType, EventData
+
+from benchmarks import result
+
+
+REPORT_RATES = [125, 1000, 8000]
+
+
+def _device() -> Device:
+    device = Device('ratbag-emu benchmark', (0x03, 0x9999, 0x9999), [GENERIC_MOUSE_RDESC])
+    device.actuators = [SensorActuator(dpi=1000)]
+    return device
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * percentile), len(values) - 1)]
+
+
+def bench_flood(device: Device, results: Dict[str, Any], repeat: int) -> None:
+    floods = [device.flood([EventData(1, 0), EventData(-1, 0)], duration=2.0) for i in range(repeat)]
+    flood = max(floods, key=lambda f: f.delivered_throughput or 0.0)
+    results['e2e/flood'] = result(flood.delivered_throughput or 0.0, 'reports/s', **flood.as_dict())
+
+
+def bench_simulate(device: Device, results: Dict[str, Any], repeat: int) -> None:
+    for rate in REPORT_RATES:
+        device.report_rate = rate
+        action = {
+            'type': ActionType.XY,
+            'duration': 1000,
+            'data': {
+                'x': 50,
+                'y': 50,
+            }
+        }
+        throughputs = []
+        for i in range(repeat):
+            with EvdevDrain(device.event_nodes) as drain:
+                start = time.perf_counter()
+                device.simulate_action(action)
+                elapsed = time.perf_counter() - start
+            throughputs.append(drain.frames / elapsed)
+        results[f'e2e/simulate/{rate}Hz'] = result(max(throughputs), 'reports/s', target=rate)
+
+
+def bench_latency(device: Device, results: Dict[str, Any], samples: int = 1000) -> None:
+    endpoint = device.endpoints[0]
+    report = endpoint.pack_input_event(endpoint.create_report(EventData(1, 0)))
+    fd = os.open(device.event_nodes[0], os.O_RDONLY | os.O_NONBLOCK)
+    poll = select.poll()
+    poll.register(fd, select.POLLIN)
+
+    latencies = []
+    try:
+        for i in range(samples):
+            start = time.perf_counter()
+            os.write(endpoint.fd, report)
+            if poll.poll(1000):
+                latencies.append(time.perf_counter() - start)
+            # drain the frame, so the next poll waits for the next report
+            while True:
+                try:
+                    os.read(fd, EVENT_SIZE * 64)
+                except BlockingIOError:
+                    break
+    finally:
+        os.close(fd)
+
+    if not latencies:
+        # Nothing reached evdev, don't abort the run over it
+        results['latency/uhid-evdev'] = result(None, 's', higher_is_better=False, lost=samples)
+        return
+
+    results['latency/uhid-evdev'] = result(_percentile(latencies, 0.5), 's', higher_is_better=False,
+                                           p99=_percentile(latencies, 0.99),
+                                           max=max(latencies),
+                                           lost=samples - len(latencies))
+
+
+def run(repeat: int = 5) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    device = _device()
+    try:
+        bench_flood(device, results, repeat)
+        bench_simulate(device, results, repeat)
+        bench_latency(device, results)
+    finally:
+        device.destroy()
+    return results
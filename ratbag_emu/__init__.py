@@ -1,7 +1,24 @@
 # SPDX-License-Identifier: MIT
 
-from .actuator import Actuator  # noqa: 401
-from .device import Device  # noqa: 401
-from .endpoint import Endpoint  # noqa: 401
-from .firmware import Firmware  # noqa: 401
-from .hw_component import HWComponent  # noqa: 401
+import typing
+
+from ratbag_emu.util import lazy_import
+
+if typing.TYPE_CHECKING:
+    from .actuator import Actuator  # noqa: 401  # pragma: no cover
+    from .device import Device  # noqa: 401  # pragma: no cover
+    from .endpoint import Endpoint  # noqa: 401  # pragma: no cover
+    from .firmware import Firmware  # noqa: 401  # pragma: no cover
+    from .hw_component import HWComponent  # noqa: 401  # pragma: no cover
+
+__all__ = ['Actuator', 'Device', 'Endpoint', 'Firmware', 'HWComponent']
+
+# Submodules are only imported when first used, so that tools which only
+# need part of ratbag_emu don't pay for (or need) hidtools and numpy
+__getattr__, __dir__ = lazy_import(__name__, {
+    'Actuator': '.actuator',
+    'Device': '.device',
+    'Endpoint': '.endpoint',
+    'Firmware': '.firmware',
+    'HWComponent': '.hw_component',
+})
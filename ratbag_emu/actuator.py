@@ -5,6 +5,8 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List
 
+from ratbag_emu.snapshot import Snapshot
+
 
 class Actuator(ABC):
     '''
@@ -21,6 +23,20 @@ class Actuator(ABC):
     def keys(self) -> List[str]:
         return self._keys
 
+    def snapshot(self) -> Snapshot:
+        '''
+        Takes a snapshot of the actuator state
+        '''
+        return Snapshot(self)
+
+    def restore(self, snap: Snapshot) -> None:
+        '''
+        Restores a snapshot of the actuator state
+
+        :param snap:    Snapshot
+        '''
+        snap.restore(self)
+
     @abstractmethod
     def transform(self, action: Dict[str, Any]) -> Dict[str, Any]:
         '''
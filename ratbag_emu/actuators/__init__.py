@@ -1,3 +1,16 @@
 # SPDX-License-Identifier: MIT
 
-from .sensor import SensorActuator  # noqa: 401
+import typing
+
+from ratbag_emu.util import lazy_import
+
+if typing.TYPE_CHECKING:
+    from .axis import AxisActuator  # noqa: 401  # pragma: no cover
+    from .sensor import SensorActuator  # noqa: 401  # pragma: no cover
+
+__all__ = ['AxisActuator', 'SensorActuator']
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'AxisActuator': '.axis',
+    'SensorActuator': '.sensor',
+})
@@ -0,0 +1,32 @@
+# SPDX-License-Identifier: MIT
+
+from typing import Any, Dict, List
+
+from ratbag_emu.actuator import Actuator
+
+
+class AxisActuator(Actuator):
+    '''
+    Represents a generic axis actuator
+
+    Transforms the values of any report field (e.g. wheel, ac pan) from
+    physical units (e.g. wheel detents) to HID counts, based on the
+    resolution and the resolution multiplier.
+
+    :param keys:        Keys to transform, named after the field usages (e.g. ``wheel``)
+    :param resolution:  Counts per physical unit
+    :param multiplier:  Resolution multiplier (e.g. 120 for hi-res scrolling)
+    '''
+    def __init__(self, keys: List[str], resolution: float = 1.0, multiplier: int = 1):
+        super().__init__()
+        self._keys = keys
+        self.resolution = resolution
+        self.multiplier = multiplier
+
+    def transform(self, action: Dict[str, Any]) -> Dict[str, Any]:
+        hid_action = action.copy()
+
+        for key in self._keys:
+            if key in hid_action:
+                hid_action[key] = int(round(action[key] * self.resolution * self.multiplier))
+        return hid_action
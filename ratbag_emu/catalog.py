@@ -0,0 +1,324 @@
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import pickle
+import typing
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ratbag_emu.actuator import Actuator
+from ratbag_emu.hw_component import HWComponent
+
+if typing.TYPE_CHECKING:
+    from ratbag_emu.device import Device  # pragma: no cover
+
+
+# Bump when the format of the cached artifacts changes
+CACHE_VERSION = 2
+
+BUSES = {
+    'usb': 0x03,
+    'bluetooth': 0x05,
+}
+
+DEFAULT_PATH = Path(__file__).parent / 'devices'
+
+
+def default_cache_dir() -> Path:
+    cache = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    return Path(cache) / 'ratbag-emu'
+
+
+def _hidtools_version() -> str:
+    import hidtools.hid
+
+    # hid-tools doesn't expose its version, use the parser module instead
+    stat = os.stat(hidtools.hid.__file__)
+    return f'{stat.st_mtime_ns}-{stat.st_size}'
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _int(value: Union[int, str]) -> int:
+    return value if isinstance(value, int) else int(value, 0)
+
+
+def _parse_rdesc(rdesc: Union[str, List[int]]) -> List[int]:
+    if isinstance(rdesc, str):
+        return [int(byte, 16) for byte in rdesc.split()]
+    return rdesc
+
+
+def _resolve(name: str, module: str) -> Any:
+    '''
+    Resolves a class name
+
+    Names without a module are looked up in the default module.
+
+    :param name:    Class name, optionally with its module (``module.Class``)
+    :param module:  Default module
+    '''
+    if '.' in name:
+        module, name = name.rsplit('.', 1)
+    return getattr(importlib.import_module(module), name)
+
+
+class CompiledRdesc(object):
+    '''
+    Represents a precompiled report descriptor
+
+    Holds the parsed report descriptor and the report encoder, which are
+    cached on disk so that they don't need to be created again.
+
+    :param rdesc:   Report descriptor
+    '''
+    def __init__(self, rdesc: List[int]):
+        # hidtools is only needed once we compile, not to query the catalog
+        import hidtools.hid
+        from ratbag_emu.encoder import ReportEncoder
+
+        self.parsed = hidtools.hid.ReportDescriptor.from_bytes(rdesc)
+        self.encoder = ReportEncoder.compile(self.parsed)
+
+    @staticmethod
+    def key(rdesc: List[int]) -> str:
+        # The artifacts are pickled hidtools objects, so they depend on its version
+        return hashlib.sha256(bytes(rdesc) + _hidtools_version().encode()).hexdigest()
+
+
+class DeviceModel(object):
+    '''
+    Represents a device model from the catalog
+
+    :param catalog: Owner catalog
+    :param data:    Model definition
+    '''
+    def __init__(self, catalog: 'Catalog', data: Dict[str, Any]):
+        self._catalog = catalog
+
+        self.name: str = data['name']
+        bus = data.get('bus', 'usb')
+        self.info: Tuple[int, int, int] = (BUSES[bus] if bus in BUSES else _int(bus),
+                                           _int(data['vid']),
+                                           _int(data['pid']))
+        self.rdescs = [_parse_rdesc(rdesc) for rdesc in data['rdescs']]
+        self.report_rate: int = data.get('report_rate', 100)
+        self.actuators: List[Dict[str, Any]] = data.get('actuators', [])
+        self.hw: Dict[str, Dict[str, Any]] = data.get('hw', {})
+        self.firmware: str = data.get('firmware', 'ratbag_emu.firmware.Firmware')
+
+        self._compiled: Optional[List[CompiledRdesc]] = None
+
+    @property
+    def compiled(self) -> List[CompiledRdesc]:
+        if self._compiled is None:
+            self._compiled = [self._catalog.compile(rdesc) for rdesc in self.rdescs]
+        return self._compiled
+
+    def create(self) -> 'Device':
+        '''
+        Creates a device of this model
+        '''
+        from ratbag_emu.device import Device
+        from ratbag_emu.firmware import Firmware
+
+        device = Device(self.name, self.info,
+                        [compiled.parsed for compiled in self.compiled],
+                        [compiled.encoder for compiled in self.compiled])
+        device.report_rate = self.report_rate
+
+        fw_class = _resolve(self.firmware, 'ratbag_emu.firmware')
+        assert issubclass(fw_class, Firmware)
+        device.fw = fw_class(device)
+
+        actuators: List[Actuator] = []
+        for spec in self.actuators:
+            spec = spec.copy()
+            actuator_class = _resolve(spec.pop('class'), 'ratbag_emu.actuators')
+            assert issubclass(actuator_class, Actuator)
+            actuators.append(actuator_class(**spec))
+        device.actuators = actuators
+
+        for name, spec in self.hw.items():
+            spec = spec.copy()
+            component_class = _resolve(spec.pop('class'), 'ratbag_emu.hardware')
+            assert issubclass(component_class, HWComponent)
+            device.hw[name] = component_class(**spec)
+
+        return device
+
+
+class Catalog(object):
+    '''
+    Represents a catalog of device models
+
+    Models are defined in JSON files, one per file, and are only loaded when
+    first used. The index (name, bus, vid, pid) of each file and the
+    precompiled report descriptors are cached, so opening a large catalog
+    and creating devices from it stays fast.
+
+    :param paths:       Directories holding the model files
+    :param cache_dir:   Cache directory, defaults to ``$XDG_CACHE_HOME/ratbag-emu``
+    :param use_cache:   Enables the on-disk cache
+    '''
+    def __init__(self, paths: Optional[Iterable[Union[str, Path]]] = None,
+                 cache_dir: Optional[Union[str, Path]] = None, use_cache: bool = True):
+        self.__logger = logging.getLogger('ratbag-emu.catalog')
+
+        self.paths = [Path(path) for path in (paths or [DEFAULT_PATH])]
+        self.cache_dir: Optional[Path] = None
+        if use_cache:
+            self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._ids: Dict[Tuple[int, int], List[str]] = {}
+        self._models: Dict[str, DeviceModel] = {}
+        self._compiled: Dict[str, CompiledRdesc] = {}
+
+    def _write_cache(self, path: Path, data: bytes) -> None:
+        # The cache is only an optimization, don't fail if it can't be written
+        try:
+            _write_atomic(path, data)
+        except OSError as e:
+            self.__logger.warning(f'unable to write {path}: {e}')
+
+    def _index_file(self, path: Path, cached: Dict[str, Any]) -> Dict[str, Any]:
+        stat = path.stat()
+        entry = cached.get(str(path))
+        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry
+
+        model = DeviceModel(self, json.loads(path.read_text()))
+        bus, vid, pid = model.info
+        return {
+            'path': str(path),
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'name': model.name,
+            'bus': bus,
+            'vid': vid,
+            'pid': pid,
+        }
+
+    @property
+    def index(self) -> Dict[str, Dict[str, Any]]:
+        '''
+        Index of the models, by name
+
+        Raises ValueError if two model files use the same name.
+        '''
+        if self._index is not None:
+            return self._index
+
+        cached: Dict[str, Any] = {}
+        index_file = self.cache_dir / 'index.json' if self.cache_dir else None
+        if index_file and index_file.is_file():
+            try:
+                cached = json.loads(index_file.read_text())
+                if cached.get('version') != CACHE_VERSION:
+                    cached = {}
+            except ValueError:
+                cached = {}
+        files = cached.get('files', {})
+
+        entries = [self._index_file(path, files)
+                   for directory in self.paths
+                   for path in sorted(directory.glob('*.json'))]
+        index: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            if entry['name'] in index:
+                raise ValueError(f'duplicated model {entry["name"]!r} in '
+                                 f'{index[entry["name"]]["path"]} and {entry["path"]}')
+            index[entry['name']] = entry
+        for entry in entries:
+            self._ids.setdefault((entry['vid'], entry['pid']), []).append(entry['name'])
+        self._index = index
+
+        indexed = {entry['path']: entry for entry in entries}
+        if index_file and indexed != files:
+            self._write_cache(index_file, json.dumps({
+                'version': CACHE_VERSION,
+                'files': indexed,
+            }).encode())
+
+        return self._index
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def names(self) -> List[str]:
+        return list(self.index)
+
+    def find(self, vid: int, pid: int, bus: Optional[int] = None) -> List[str]:
+        '''
+        Finds the models matching the vid and pid
+
+        :param vid: Vendor ID
+        :param pid: Product ID
+        :param bus: Bus type, matches any bus if None
+        '''
+        index = self.index
+        return [name for name in self._ids.get((vid, pid), [])
+                if bus in (None, index[name]['bus'])]
+
+    def get(self, name: str) -> DeviceModel:
+        '''
+        Gets a model, loading it if needed
+
+        :param name:    Model name
+        '''
+        if name not in self._models:
+            path = Path(self.index[name]['path'])
+            self._models[name] = DeviceModel(self, json.loads(path.read_text()))
+            self.__logger.debug(f'loaded {name} from {path}')
+        return self._models[name]
+
+    def create(self, name: str) -> 'Device':
+        '''
+        Creates a device of the model
+
+        :param name:    Model name
+        '''
+        return self.get(name).create()
+
+    def compile(self, rdesc: List[int]) -> CompiledRdesc:
+        '''
+        Gets the precompiled report descriptor, compiling it if needed
+
+        Artifacts are keyed by the report descriptor contents, so they are
+        shared between all models using the same descriptor.
+
+        :param rdesc:   Report descriptor
+        '''
+        key = CompiledRdesc.key(rdesc)
+        if key in self._compiled:
+            return self._compiled[key]
+
+        artifact = self.cache_dir / f'rdesc-{CACHE_VERSION}-{key}.pickle' if self.cache_dir else None
+        compiled = None
+        if artifact and artifact.is_file():
+            try:
+                compiled = pickle.loads(artifact.read_bytes())
+            except Exception:
+                self.__logger.warning(f'ignoring invalid artifact {artifact}')
+
+        if compiled is None:
+            compiled = CompiledRdesc(rdesc)
+            if artifact:
+                self._write_cache(artifact, pickle.dumps(compiled))
+
+        self._compiled[key] = compiled
+        return compiled
@@ -1,45 +1,71 @@
 # SPDX-License-Identifier: MIT
 
-import copy
 import logging
-import sched
 import time
+import weakref
 
-from typing import Any, ClassVar, Dict, List, Tuple
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Tuple, Union
+
+import hidtools.hid
 
 from ratbag_emu.actuator import Actuator
+from ratbag_emu.encoder import ReportEncoder
 from ratbag_emu.endpoint import Endpoint
 from ratbag_emu.firmware import Firmware
+from ratbag_emu.flood import EvdevDrain, FloodResult, flood
 from ratbag_emu.hw_component import HWComponent
-from ratbag_emu.util import ActionType, EventData, ms2s
+from ratbag_emu.planner import SENSOR_AXES, Planner
+from ratbag_emu.registry import approximate_size, registry
+from ratbag_emu.snapshot import DeviceSnapshot
+from ratbag_emu.util import ActionType, EventData, SimulationStats, ms2s
 
 
 class Device(object):
     '''
     Represents a real device
 
-    :param name:    Device name
-    :param info:    Bus information (bus, vid, pid)
-    :param rdescs:  Array of report descriptors
+    :param name:        Device name
+    :param info:        Bus information (bus, vid, pid)
+    :param rdescs:      Array of report descriptors, raw or already parsed
+    :param encoders:    Array of precompiled report encoders
     '''
     device_list: ClassVar[List[str]] = []
 
     def __init__(self, name: str, info: Tuple[int, int, int],
-                 rdescs: List[List[int]]):
+                 rdescs: Sequence[Union[List[int], hidtools.hid.ReportDescriptor]],
+                 encoders: Optional[Sequence[Optional[ReportEncoder]]] = None):
         self.__logger = logging.getLogger('ratbag-emu.device')
         self._name = name
         self._info = info
-        self._rdescs = rdescs
 
-        self.endpoints = []
-        for i, r in enumerate(rdescs):
-            self.endpoints.append(Endpoint(self, r, i))
+        if encoders is None:
+            encoders = [None] * len(rdescs)
+        assert len(encoders) == len(rdescs)
+
+        self._destroyed = False
+        self._buffered_reports = 0
+        self.endpoints: List[Endpoint] = []
+
+        try:
+            for i, (r, encoder) in enumerate(zip(rdescs, encoders)):
+                self.endpoints.append(Endpoint(self, r, i, encoder))
+        except Exception:
+            for endpoint in self.endpoints:
+                endpoint.destroy()
+            raise
+
+        self.planner = Planner.from_fields([field for endpoint in self.endpoints for field in endpoint.input_fields])
 
         self.report_rate = 100
         self.fw = Firmware(self)
         self.hw: Dict[str, HWComponent] = {}
         self.actuators: List[Actuator] = []
 
+        registry.register(self)
+        Device.device_list.append(name)
+        # Devices which are never destroyed leave the list when collected
+        self._unlist = weakref.finalize(self, Device.device_list.remove, name)
+
     @property
     def name(self) -> str:
         return self._name
@@ -58,7 +84,7 @@ class Device(object):
 
     @property
     def rdescs(self) -> List[List[int]]:
-        return self._rdescs
+        return [endpoint.rdesc for endpoint in self.endpoints]
 
     @property
     def actuators(self) -> List[Actuator]:
@@ -76,23 +102,69 @@ class Device(object):
         self._actuators = val
 
     def destroy(self) -> None:
+        if self._destroyed:
+            return
+
         for endpoint in self.endpoints:
             endpoint.destroy()
 
+        self._destroyed = True
+        registry.unregister(self)
+        self._unlist()
+
+    def resources(self) -> Dict[str, int]:
+        '''
+        Returns the resources held by the device
+
+        Includes the open uhid fds, the kernel event and hidraw nodes, the
+        reports planned but not sent yet and the approximate memory used
+        (bytes).
+        '''
+        return {
+            'fds': sum(1 for endpoint in self.endpoints if not endpoint.is_destroyed),
+            'event_nodes': len(self.event_nodes),
+            'hidraw_nodes': len(self.hidraw_nodes),
+            'buffered_reports': self._buffered_reports,
+            'memory': approximate_size(self, set()),
+        }
+
+    def snapshot(self) -> DeviceSnapshot:
+        '''
+        Takes a snapshot of the device state
+
+        The snapshot covers the report rate, hardware components, actuators
+        and firmware. Unchanged state is shared between snapshots, so they
+        are cheap to take.
+        '''
+        return DeviceSnapshot(self)
+
+    def restore(self, snap: DeviceSnapshot) -> None:
+        '''
+        Restores a snapshot of the device state
+
+        Only the state which changed since the snapshot was taken is
+        restored.
+
+        :param snap:    Snapshot
+        '''
+        snap.restore(self)
+
     def transform_action(self, data: Dict[str, Any]) -> Dict[str, Any]:
         '''
         Transforms high-level action according to the actuators
 
         A high-level action will have the x, y values in mm. This values will
         be converted to dots by the device actuators (in this case, the
-        sensor/dpi actuator)
+        sensor/dpi actuator). Other values without an actuator are passed
+        as-is, x and y are dropped as they are never in dots.
 
         :param action:  high-level action
         '''
-        hid_data: Dict[str, Any] = {}
+        hid_data = {key: value for key, value in data.items() if key not in SENSOR_AXES}
 
         for actuator in self.actuators:
-            hid_data.update(actuator.transform(data.copy()))
+            transformed = actuator.transform(data.copy())
+            hid_data.update((key, transformed[key]) for key in actuator.keys if key in transformed)
 
         return hid_data
 
@@ -109,74 +181,77 @@ class Device(object):
         for endpoint in self.endpoints:
             endpoint.send(endpoint.create_report(action))
 
-    def _simulate_action_xy(self, action: Dict[str, Any], packets: List[EventData], report_count: int) -> None:
-        # FIXME: Read max size from the report descriptor
-        axis_max = 127
-        axis_min = -127
+    def flood(self, pattern: List[EventData], count: Optional[int] = None, duration: Optional[float] = None,
+              rate: Optional[float] = None, drain: bool = True) -> FloodResult:
+        '''
+        Floods the device with HID reports
+
+        Encodes the pattern once and sends it in a loop, as fast as possible
+        or at the target rate, ignoring the report rate. This is used to
+        measure the throughput of the uhid -> hid -> evdev path.
 
-        # We assume a linear motion
-        dot_buffer = {}
-        step = {}
+        The pattern should only contain relative movement, the kernel
+        filters out repeated absolute values (e.g. buttons), so those would
+        not reach evdev.
 
+        :param pattern:     Actions to send, in a loop
+        :param count:       Number of reports to send
+        :param duration:    Duration of the flood (seconds)
+        :param rate:        Target rate (reports/second)
+        :param drain:       Drains the event nodes, counting the delivered reports
         '''
-        Initialize dot_buffer, real_dot_buffer and step for X and Y
+        writes = []
+        for action in pattern:
+            for endpoint in self.endpoints:
+                report = endpoint.create_report(action)
+                if report:
+                    writes.append((endpoint.fd, endpoint.pack_input_event(report)))
 
-        dot_buffer holds the ammount of dots left to send (kinda,
-        read below).
+        if not drain:
+            return FloodResult(*flood(writes, count, duration, rate))
 
-        We actually have two variables for this, real_dot_buffer and
-        dot_buffer. dot_buffer mimics the user movement and
-        real_dot_buffer holds true number of dots left to send.
-        When using high report rates (ex. 1000Hz) we usually don't
-        have a full dot to send, that's why we need two variables. We
-        subtract the step to dot_buffer at each iteration, when the
-        difference between dot_buffer and real_dot_buffer is equal
-        or higher than 1 dot we then send a HID report to the device
-        with that difference (int! we send the int part of the
-        difference) and update real_dot_buffer to include this
-        changes.
-        '''
-        dot_buffer = self.transform_action(action['data'])
+        with EvdevDrain(self.event_nodes) as evdev_drain:
+            accepted, errors, elapsed = flood(writes, count, duration, rate)
 
-        for attr in ['x', 'y']:
-            assert dot_buffer[attr] <= axis_max * report_count
-            step[attr] = dot_buffer[attr] / report_count
+        return FloodResult(accepted, errors, elapsed, evdev_drain)
 
-        real_dot_buffer = copy.deepcopy(dot_buffer)
+    def _simulate_action_axes(self, action: Dict[str, Any], packets: List[EventData]) -> None:
+        '''
+        The planner gives each axis its share of the movement in every
+        report slot, following the motion profile. We assume a linear
+        motion if the action doesn't specify a profile.
+
+        When using high report rates (ex. 1000Hz) we usually don't have a
+        full dot to send in each report, so the remainder is carried over
+        to the next reports. Each axis is limited to the logical range of
+        its report field, if a report goes over it the excess is left to be
+        sent in the next report.
+        '''
+        dots = self.transform_action(action['data'])
+        missing = set(action['data']) - set(dots)
+        assert not missing, f'no actuator for {", ".join(sorted(missing))}'
 
-        for packet in packets:
-            if not real_dot_buffer['x']:
-                break
-
-            for attr in ['x', 'y']:
-                dot_buffer[attr] -= step[attr]
-                diff = int(round(real_dot_buffer[attr] - dot_buffer[attr]))
-                '''
-                The max is 127, if this happens we need to leave the
-                excess in the buffer for it to be sent in the next
-                report
-                '''
-                if abs(diff) >= 1:
-                    if abs(diff) > axis_max:
-                        diff = axis_max if diff > 0 else axis_min
-                    setattr(packet, attr, diff)
-                    real_dot_buffer[attr] -= diff
+        self.planner.plan(dots, packets, action.get('profile'))
 
     def _simulate_action_button(self, action: Dict[str, Any], packets: List[EventData]) -> None:
         for packet in packets:
             setattr(packet, 'b{}'.format(action['data']['id']), 1)
 
-    def simulate_action(self, action: Dict[str, Any], type: int = None) -> None:
+    def plan_action(self, action: Dict[str, Any]) -> List[EventData]:
         '''
-        Simulates action
+        Plans action
 
         Translates physical values according to the device properties and
-        converts action into HID reports.
+        splits the action into the HID reports that should be sent, one for
+        each report slot.
+
+        XY and AXES actions can set a :class:`ratbag_emu.motion.MotionProfile`
+        in ``action['profile']``, otherwise the movement is linear. AXES
+        actions can move any axis of the report descriptor (e.g. ``wheel``),
+        not only the sensor.
 
         :param action:  high-level action
-        :param type:    HID report type
         '''
-
         packets: List[EventData] = []
 
         report_count = int(round(ms2s(action['duration']) * self.report_rate))
@@ -184,18 +259,108 @@ class Device(object):
         if not report_count:
             report_count = 1
 
+        # Absolute axes hold their position in every report
         for i in range(report_count):
-            packets.append(EventData())
+            packet = EventData()
+            packet.__dict__.update(self.planner.positions)
+            packets.append(packet)
 
-        if action['type'] == ActionType.XY:
-            self._simulate_action_xy(action, packets, report_count)
+        if action['type'] in (ActionType.XY, ActionType.AXES):
+            self._simulate_action_axes(action, packets)
         elif action['type'] == ActionType.BUTTON:
-            self._simulate_action_xy(action, packets, report_count)
+            self._simulate_action_button(action, packets)
 
-        s = sched.scheduler(time.time, time.sleep)
-        next_time = 0.0
-        for packet in packets:
-            s.enter(next_time, 1, self.send_hid_action,
-                    kwargs={'action': packet})
-            next_time += 1 / self.report_rate
-        s.run()
+        return packets
+
+    def _field_limits(self) -> Dict[str, Tuple[bool, int, int]]:
+        '''
+        Returns (relative, logical min, logical max) of the report fields,
+        by attribute name
+        '''
+        limits = {}
+        for endpoint in self.endpoints:
+            for field in endpoint.input_fields:
+                limits[field.attr] = (field.relative, field.logical_min, field.logical_max)
+        return limits
+
+    def _merge_packets(self, first: EventData, second: EventData,
+                       limits: Dict[str, Tuple[bool, int, int]]) -> Optional[EventData]:
+        '''
+        Merges two consecutive packets into one
+
+        Relative values are added, as long as they stay within the logical
+        limits. Anything else (e.g. buttons) must be the same in both
+        packets, otherwise we would lose an edge. Returns None if the
+        packets can't be merged.
+        '''
+        merged = EventData()
+        for attr in set(vars(first)) | set(vars(second)):
+            a = getattr(first, attr, 0)
+            b = getattr(second, attr, 0)
+            relative, logical_min, logical_max = limits.get(attr, (False, 0, 0))
+            if relative:
+                if not logical_min <= a + b <= logical_max:
+                    return None
+                setattr(merged, attr, a + b)
+            elif a != b:
+                return None
+            else:
+                setattr(merged, attr, a)
+        return merged
+
+    def simulate_action(self, action: Dict[str, Any], type: int = None, coalesce: bool = False) -> SimulationStats:
+        '''
+        Simulates action
+
+        Translates physical values according to the device properties and
+        converts action into HID reports.
+
+        If we fall behind schedule, the late reports are sent back-to-back.
+        With coalesce enabled, when we are more than one report slot late,
+        the pending reports are merged into the next one instead, as long as
+        the merged values fit the report and no button edge is lost.
+
+        :param action:      high-level action
+        :param type:        HID report type
+        :param coalesce:    Coalesces reports when falling behind schedule
+        '''
+        packets = self.plan_action(action)
+        limits = self._field_limits() if coalesce else {}
+        stats = SimulationStats(len(packets))
+
+        def send(packet: EventData) -> None:
+            self.send_hid_action(packet)
+            if any(vars(packet).values()):
+                stats.reports += 1
+
+        period = 1 / self.report_rate
+        start = time.monotonic()
+        pending: Optional[EventData] = None
+        try:
+            for slot, packet in enumerate(packets):
+                self._buffered_reports = len(packets) - slot
+                delay = start + slot * period - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                late = delay < -period
+                if late:
+                    stats.late += 1
+
+                if pending is not None:
+                    merged = self._merge_packets(pending, packet, limits)
+                    if merged is None:
+                        send(pending)
+                    else:
+                        packet = merged
+                        stats.coalesced += 1
+                    pending = None
+
+                if coalesce and late and slot < len(packets) - 1:
+                    pending = packet
+                    continue
+
+                send(packet)
+        finally:
+            self._buffered_reports = 0
+
+        return stats
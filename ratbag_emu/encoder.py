@@ -0,0 +1,122 @@
+# SPDX-License-Identifier: MIT
+
+from typing import List, Optional
+
+import hidtools.hid
+
+
+def default_report_id(rdesc: hidtools.hid.ReportDescriptor) -> int:
+    '''
+    Returns the input report used when no report ID is given
+
+    That's the unnumbered report, or the first input report for
+    descriptors with report IDs.
+
+    :param rdesc:   Parsed report descriptor
+    '''
+    if -1 in rdesc.input_reports or not rdesc.input_reports:
+        return -1
+    return next(iter(rdesc.input_reports))
+
+
+class EncoderField(object):
+    '''
+    Represents a field of a precompiled report
+
+    :param field:   Parsed HID field
+    '''
+    def __init__(self, field: hidtools.hid.HidField):
+        self.field = field
+        self.attr = field.usage_name.replace(' ', '').lower()
+        self.start = field.start
+        self.size = field.size
+        self.mask = (1 << field.size) - 1
+        self.logical_min = field.logical_min
+        self.logical_max = field.logical_max
+        self.relative = bool(field.type & (0x1 << 2))
+
+
+def input_fields(rdesc: hidtools.hid.ReportDescriptor) -> List[EncoderField]:
+    '''
+    Returns the variable fields of all the input reports
+
+    :param rdesc:   Parsed report descriptor
+    '''
+    return [EncoderField(field) for report in rdesc.input_reports.values()
+            for field in report if not field.is_const and not field.is_array]
+
+
+class ReportEncoder(object):
+    '''
+    Represents a precompiled HID report encoder
+
+    The layout of the input report is extracted from the parsed report
+    descriptor once, so creating a report does not need to walk the
+    descriptor items again. The produced reports are the same as the ones
+    from :meth:`hidtools.hid.ReportDescriptor.create_report`.
+
+    :param report:  Parsed HID input report
+    '''
+    def __init__(self, report: hidtools.hid.HidReport):
+        self.report_id = report.report_ID
+        self.numbered = report.numbered
+        self.size = report.size
+        self.fields = [EncoderField(field) for field in report if not field.is_const]
+
+    @classmethod
+    def compile(cls, rdesc: hidtools.hid.ReportDescriptor,
+                report_id: Optional[int] = None) -> Optional['ReportEncoder']:
+        '''
+        Compiles an encoder for an input report
+
+        Returns None if the report can't be precompiled, which happens when
+        it has array fields or the same usage more than once (e.g.
+        multitouch devices).
+
+        :param rdesc:       Parsed report descriptor
+        :param report_id:   Report ID, defaults to :func:`default_report_id`
+        '''
+        if report_id is None:
+            report_id = default_report_id(rdesc)
+        report = rdesc.input_reports.get(report_id)
+        if report is None:
+            return None
+
+        seen: List[str] = []
+        for field in report:
+            if field.is_const:
+                continue
+            if field.is_array or field.usage_name in seen:
+                return None
+            seen.append(field.usage_name)
+
+        return cls(report)
+
+    def field(self, attr: str) -> Optional[EncoderField]:
+        '''
+        Returns the field matching the attribute name or None
+
+        :param attr:    Attribute name (e.g. ``x``, ``wheel``)
+        '''
+        for field in self.fields:
+            if field.attr == attr:
+                return field
+        return None
+
+    def encode(self, data: object) -> List[int]:
+        '''
+        Converts data into a HID report
+
+        :param data:    Object holding the field values as attributes
+        '''
+        value = 0
+        for field in self.fields:
+            v = getattr(data, field.attr, 0)
+            if v < field.logical_min or v > field.logical_max:
+                raise hidtools.hid.RangeError(field.field, v)
+            value |= (v & field.mask) << field.start
+
+        if self.numbered:
+            value |= self.report_id
+
+        return list(value.to_bytes(self.size, 'little'))
@@ -5,9 +5,12 @@ import struct
 import time
 import typing
 
+import hidtools.hid
 import hidtools.uhid
 
-from typing import List
+from typing import List, Optional, Union
+
+from ratbag_emu.encoder import EncoderField, ReportEncoder, default_report_id, input_fields
 
 if typing.TYPE_CHECKING:
     from ratbag_emu.device import Device  # pragma: no cover
@@ -21,11 +24,13 @@ class Endpoint(hidtools.uhid.UHIDDevice):
     receive and send data
 
     :param owner:   Endpoint owner
-    :param rdesc:   Report descriptor
+    :param rdesc:   Report descriptor, raw or already parsed
     :param number:  Endpoint number
+    :param encoder: Precompiled report encoder
     '''
 
-    def __init__(self, owner: 'Device', rdesc: List[int], number: int):
+    def __init__(self, owner: 'Device', rdesc: Union[List[int], hidtools.hid.ReportDescriptor], number: int,
+                 encoder: Optional[ReportEncoder] = None):
         super().__init__()
 
         self.__logger = logging.getLogger('ratbag-emu.endpoint')
@@ -35,6 +40,7 @@ class Endpoint(hidtools.uhid.UHIDDevice):
         self._info = owner.info
         self.rdesc = rdesc
         self.number = number
+        self.encoder = encoder or ReportEncoder.compile(self.parsed_rdesc)
         self.name = f'ratbag-emu {owner.name} ({self.vid:04x}:{self.pid:04x}, {self.number})'
 
         self._output_report = self._receive
@@ -47,6 +53,22 @@ class Endpoint(hidtools.uhid.UHIDDevice):
 
         self.__logger.debug(f'created endpoint {self.number} ({self.name})')
 
+    @property
+    def is_destroyed(self) -> bool:
+        return self._is_destroyed
+
+    @property
+    def input_fields(self) -> List[EncoderField]:
+        '''
+        Fields of the input reports
+
+        Taken from the encoder when there is one, otherwise from the parsed
+        report descriptor (e.g. descriptors with report IDs).
+        '''
+        if self.encoder:
+            return self.encoder.fields
+        return input_fields(self.parsed_rdesc)
+
     @property
     def uhid_dev_is_ready(self) -> bool:
         return self.udev_device is not None
@@ -85,6 +107,17 @@ class Endpoint(hidtools.uhid.UHIDDevice):
 
         self.call_input_event(data)
 
+    def pack_input_event(self, data: List[int]) -> bytes:
+        '''
+        Packs a HID report into a uhid input event
+
+        The result can be written directly to :attr:`fd`, which avoids
+        packing the event on every send.
+
+        :param data:    HID report
+        '''
+        return struct.pack('< L H 4096s', self._UHID_INPUT2, len(data), bytes(data))
+
     def create_report(self, action: object, global_data: int = None, skip_empty: bool = True) -> List[int]:
         '''
         Converts action into HID report
@@ -105,4 +138,7 @@ class Endpoint(hidtools.uhid.UHIDDevice):
         if empty and skip_empty:
             return []
 
-        return super().create_report(action, global_data)
+        if self.encoder and global_data is None:
+            return self.encoder.encode(action)
+
+        return self.parsed_rdesc.create_report(action, global_data, default_report_id(self.parsed_rdesc))
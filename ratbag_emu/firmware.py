@@ -5,6 +5,8 @@ import typing
 
 from typing import List
 
+from ratbag_emu.snapshot import Snapshot
+
 if typing.TYPE_CHECKING:
     from ratbag_emu.device import Device  # pragma: no cover
 
@@ -21,6 +23,20 @@ class Firmware(object):
 
         self._owner = owner
 
+    def snapshot(self) -> Snapshot:
+        '''
+        Takes a snapshot of the firmware state
+        '''
+        return Snapshot(self, exclude=['_owner'])
+
+    def restore(self, snap: Snapshot) -> None:
+        '''
+        Restores a snapshot of the firmware state
+
+        :param snap:    Snapshot
+        '''
+        snap.restore(self)
+
     def hid_receive(self, data: List[int], size: int, rtype: int, endpoint: int) -> List[int]:
         '''
         Receive data
@@ -0,0 +1,197 @@
+# SPDX-License-Identifier: MIT
+
+import array
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+
+# struct input_event: struct timeval time; __u16 type; __u16 code; __s32 value
+EVENT_FORMAT = 'llHHi'
+EVENT_SIZE = struct.calcsize(EVENT_FORMAT)
+
+EV_SYN = 0x00
+SYN_REPORT = 0x00
+SYN_DROPPED = 0x03
+
+
+def _type_code(type: int, code: int) -> int:
+    # type and code as read from the event as a single 32-bit word
+    if sys.byteorder == 'little':
+        return type | code << 16
+    return type << 16 | code  # pragma: no cover
+
+
+class EvdevDrain(object):
+    '''
+    Drains evdev nodes, counting the received events
+
+    Reads the nodes as fast as possible in a thread and counts the events
+    in bulk, without decoding each one of them.
+
+    :param nodes:   Event nodes
+    '''
+    def __init__(self, nodes: Sequence[str]):
+        self.events = 0
+        self.frames = 0
+        self.syn_dropped = 0
+        self.last_event = time.monotonic()
+
+        self._fds = [os.open(node, os.O_RDONLY | os.O_NONBLOCK) for node in nodes]
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> 'EvdevDrain':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_details: Any) -> None:
+        self.stop()
+
+    def _read(self, fd: int) -> None:
+        try:
+            data = os.read(fd, EVENT_SIZE * 1024)
+        except BlockingIOError:
+            return
+
+        words = array.array('I', data[:len(data) - len(data) % EVENT_SIZE])
+        type_code = words[struct.calcsize('ll') // 4::EVENT_SIZE // 4]
+
+        self.events += len(type_code)
+        self.frames += type_code.count(_type_code(EV_SYN, SYN_REPORT))
+        self.syn_dropped += type_code.count(_type_code(EV_SYN, SYN_DROPPED))
+        self.last_event = time.monotonic()
+
+    def _run(self) -> None:
+        poll = select.poll()
+        for fd in self._fds:
+            poll.register(fd, select.POLLIN)
+
+        while not self._stop.is_set():
+            for fd, mask in poll.poll(10):
+                self._read(fd)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, settle: float = 0.1, timeout: float = 5.0) -> None:
+        '''
+        Stops draining once no events were received for a while
+
+        :param settle:  Time without events to wait for (seconds)
+        :param timeout: Maximum time to wait for (seconds)
+        '''
+        end = time.monotonic() + timeout
+        while time.monotonic() - self.last_event < settle and time.monotonic() < end:
+            time.sleep(settle / 10)
+
+        self._stop.set()
+        self._thread.join()
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = []
+
+
+class FloodResult(object):
+    '''
+    Represents the result of a flood
+
+    :param accepted:    Reports accepted by uhid
+    :param errors:      Reports uhid failed to accept
+    :param duration:    Time spent sending the reports (seconds)
+    :param drain:       Drain of the device evdev nodes
+    '''
+    def __init__(self, accepted: int, errors: int, duration: float, drain: Optional[EvdevDrain] = None):
+        self.accepted = accepted
+        self.errors = errors
+        self.duration = duration
+        self.delivered: Optional[int] = drain.frames if drain else None
+        self.syn_dropped: Optional[int] = drain.syn_dropped if drain else None
+
+    @property
+    def dropped(self) -> Optional[int]:
+        if self.delivered is None:
+            return None
+        return max(self.accepted - self.delivered, 0)
+
+    @property
+    def throughput(self) -> float:
+        '''
+        Sustained rate of reports accepted by uhid (reports/second)
+        '''
+        return self.accepted / self.duration if self.duration else 0.0
+
+    @property
+    def delivered_throughput(self) -> Optional[float]:
+        '''
+        Sustained rate of reports delivered to evdev (reports/second)
+        '''
+        if self.delivered is None:
+            return None
+        return self.delivered / self.duration if self.duration else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'accepted': self.accepted,
+            'errors': self.errors,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'syn_dropped': self.syn_dropped,
+            'duration': self.duration,
+            'throughput': self.throughput,
+            'delivered_throughput': self.delivered_throughput,
+        }
+
+
+def flood(writes: Sequence[Tuple[int, bytes]], count: Optional[int] = None,
+          duration: Optional[float] = None, rate: Optional[float] = None) -> Tuple[int, int, float]:
+    '''
+    Writes pre-packed uhid events in a loop
+
+    Stops after count writes or after duration seconds, whichever comes
+    first. Writes as fast as possible, unless a target rate is given.
+
+    Returns the number of accepted writes, failed writes and the elapsed
+    time.
+
+    :param writes:      Pattern of (fd, uhid event) to write
+    :param count:       Number of writes
+    :param duration:    Duration (seconds)
+    :param rate:        Target rate (writes/second)
+    '''
+    assert writes
+    assert count is not None or duration is not None
+
+    write = os.write
+    clock = time.perf_counter
+    period = 1 / rate if rate else 0.0
+    n = len(writes)
+    accepted = errors = i = 0
+
+    start = clock()
+    end = start + duration if duration is not None else float('inf')
+    while count is None or i < count:
+        fd, buf = writes[i % n]
+        try:
+            write(fd, buf)
+            accepted += 1
+        except OSError:
+            errors += 1
+        i += 1
+
+        if period:
+            # sleep when we are well ahead of schedule, spin otherwise
+            ahead = start + i * period - clock()
+            if ahead > 0.001:
+                time.sleep(ahead)
+            while clock() < start + i * period:
+                pass
+        if (period or not i & 0xff) and clock() >= end:
+            break
+
+    return accepted, errors, clock() - start
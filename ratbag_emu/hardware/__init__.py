@@ -1,3 +1,14 @@
 # SPDX-License-Identifier: MIT
 
-from .led import LedComponent  # noqa: 401
+import typing
+
+from ratbag_emu.util import lazy_import
+
+if typing.TYPE_CHECKING:
+    from .led import LedComponent  # noqa: 401  # pragma: no cover
+
+__all__ = ['LedComponent']
+
+__getattr__, __dir__ = lazy_import(__name__, {
+    'LedComponent': '.led',
+})
@@ -4,6 +4,8 @@ import logging
 
 from typing import Any
 
+from ratbag_emu.snapshot import Snapshot
+
 
 class HWComponent(object):
     '''
@@ -15,3 +17,17 @@ class HWComponent(object):
         self.__logger = logging.getLogger('ratbag-emu.hw_component')
 
         self.state = state
+
+    def snapshot(self) -> Snapshot:
+        '''
+        Takes a snapshot of the component state
+        '''
+        return Snapshot(self)
+
+    def restore(self, snap: Snapshot) -> None:
+        '''
+        Restores a snapshot of the component state
+
+        :param snap:    Snapshot
+        '''
+        snap.restore(self)
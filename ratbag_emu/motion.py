@@ -0,0 +1,134 @@
+# SPDX-License-Identifier: MIT
+
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+EASINGS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'linear': lambda t: t,
+    'ease-in': lambda t: t ** 3,
+    'ease-out': lambda t: 1 - (1 - t) ** 3,
+    'ease-in-out': lambda t: np.where(t < 0.5, 4 * t ** 3, 1 - (2 - 2 * t) ** 3 / 2),
+}
+
+
+class MotionProfile(object):
+    '''
+    Represents a motion profile
+
+    Describes how a movement progresses over time: the shape of the path,
+    the velocity along it and the sensor noise. Trajectories are generated
+    for all report slots at once.
+
+    The path is a cubic bezier curve from the origin to the destination.
+    Its control points are given as (along, across) pairs, relative to the
+    movement vector, so ``[(0.25, 0.5), (0.75, 0.5)]`` bends the path to
+    the left by about a third of its length. No control points mean a
+    straight line.
+
+    :param easing:          Velocity profile (linear, ease-in, ease-out, ease-in-out)
+    :param control_points:  Bezier control points (along, across)
+    :param jitter:          Standard deviation of the gaussian sensor noise (dots)
+    :param dropout:         Probability of the sensor losing tracking in a report slot
+    :param seed:            Seed for the noise
+    '''
+    def __init__(self, easing: str = 'linear',
+                 control_points: Optional[Sequence[Tuple[float, float]]] = None,
+                 jitter: float = 0.0, dropout: float = 0.0, seed: Optional[int] = None):
+        assert easing in EASINGS
+        assert control_points is None or len(control_points) == 2
+        assert 0 <= dropout < 1
+
+        self.easing = easing
+        self.control_points = control_points
+        self.jitter = jitter
+        self.dropout = dropout
+        self._rng = np.random.default_rng(seed)
+
+    def _path(self, s: np.ndarray, total: np.ndarray) -> np.ndarray:
+        positions = np.outer(s, total)
+        if self.control_points is None or total.size < 2:
+            return positions
+
+        # Cubic bezier in the plane of the first two axes, P0 = 0 and P3 = total
+        along = total[:2]
+        across = np.array([-along[1], along[0]])
+        p1, p2 = [a * along + c * across for a, c in self.control_points]
+        b1 = 3 * (1 - s) ** 2 * s
+        b2 = 3 * (1 - s) * s ** 2
+        b3 = s ** 3
+        positions[:, :2] = np.outer(b1, p1) + np.outer(b2, p2) + np.outer(b3, along)
+        return positions
+
+    def trajectory(self, total: Sequence[float], count: int) -> np.ndarray:
+        '''
+        Generates the trajectory of a movement
+
+        Returns the position at the end of each report slot, with shape
+        (count, axes). Positions are not quantized, the last one is always
+        the exact total.
+
+        :param total:   Total movement of each axis (dots)
+        :param count:   Number of report slots
+        '''
+        t = np.arange(1, count + 1) / count
+        positions = self._path(EASINGS[self.easing](t), np.asarray(total, dtype=float))
+
+        if self.jitter:
+            noise = self._rng.normal(0.0, self.jitter, positions.shape)
+            noise[-1] = 0
+            positions += noise
+
+        if self.dropout:
+            # While tracking is lost the position holds, it is caught up once it's back
+            lost = self._rng.random(count) < self.dropout
+            lost[-1] = False
+            origin = np.zeros((1, positions.shape[1]))
+            index = np.maximum.accumulate(np.where(lost, 0, np.arange(1, count + 1)))
+            positions = np.concatenate((origin, positions))[index]
+
+        return positions
+
+
+def quantize(positions: np.ndarray,
+             axis_min: Union[int, Sequence[int], np.ndarray],
+             axis_max: Union[int, Sequence[int], np.ndarray]) -> np.ndarray:
+    '''
+    Quantizes a trajectory into per-report deltas
+
+    Each delta is the difference between the rounded positions, so the
+    rounding error is carried over to the next report instead of
+    accumulating. Deltas are clamped to the axis limits, the excess is
+    carried over to the next report. Whatever still doesn't fit in the
+    last report is spread over the earlier ones, latest first.
+
+    :param positions:   Trajectory, with shape (count, axes)
+    :param axis_min:    Minimum delta of each axis
+    :param axis_max:    Maximum delta of each axis
+    '''
+    rounded = np.rint(positions).astype(np.int64)
+    count = rounded.shape[0]
+    axis_min = np.asarray(axis_min)
+    axis_max = np.asarray(axis_max)
+    total = rounded[-1]
+    assert np.all(total >= count * axis_min) and np.all(total <= count * axis_max), \
+        'movement exceeds the axis limits'
+
+    # Follow the rounded positions as closely as the limits allow. Limiting
+    # the speed is a running minimum (maximum) of the positions relative to
+    # a line moving at the max (min) speed, so it's a single scan.
+    target = np.concatenate((np.zeros((1, rounded.shape[1]), dtype=np.int64), rounded))
+    k = np.arange(count + 1).reshape(-1, 1)
+    limited = k * axis_max + np.minimum.accumulate(target - k * axis_max, axis=0)
+    limited = k * axis_min + np.maximum.accumulate(limited - k * axis_min, axis=0)
+    deltas = np.diff(limited, axis=0)
+
+    # Fill the room left in the earlier reports, from the last one backwards
+    leftover = total - limited[-1]
+    if leftover.any():
+        room = np.where(leftover > 0, axis_max - deltas, deltas - axis_min)[::-1]
+        used = np.cumsum(room, axis=0) - room
+        deltas += (np.sign(leftover) * np.clip(np.abs(leftover) - used, 0, room))[::-1]
+
+    return deltas
@@ -0,0 +1,129 @@
+# SPDX-License-Identifier: MIT
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ratbag_emu.encoder import EncoderField
+from ratbag_emu.motion import MotionProfile, quantize
+from ratbag_emu.util import EventData
+
+
+# Axes which follow the motion profile path, the others move along it
+SENSOR_AXES = ['x', 'y']
+
+
+class Axis(object):
+    '''
+    Represents an axis of the device
+
+    Relative axes (e.g. x, y, wheel) report movement deltas, absolute axes
+    report the current position.
+
+    :param attr:            Attribute name (e.g. ``x``, ``wheel``, ``acpan``)
+    :param logical_min:     Logical minimum of the report field
+    :param logical_max:     Logical maximum of the report field
+    :param relative:        Whether the axis is relative
+    '''
+    def __init__(self, attr: str, logical_min: int, logical_max: int, relative: bool = True):
+        self.attr = attr
+        self.logical_min = logical_min
+        self.logical_max = logical_max
+        self.relative = relative
+
+
+DEFAULT_AXES = [Axis(attr, -127, 127) for attr in SENSOR_AXES]
+
+
+class Planner(object):
+    '''
+    Represents the axis planner of a device
+
+    Splits the movement of all the axes of an action into report slots, in
+    one vectorized pass. Each axis is limited to the logical range of its
+    report field. Absolute axes hold their position between actions.
+
+    :param axes:    Axes of the device
+    '''
+    def __init__(self, axes: Sequence[Axis]):
+        self.axes = {axis.attr: axis for axis in axes}
+        self.positions = {axis.attr: 0 for axis in axes if not axis.relative}
+
+    @classmethod
+    def from_fields(cls, fields: Sequence[EncoderField]) -> 'Planner':
+        '''
+        Creates a planner with the axes found in the input report fields
+
+        Relative fields and multi-bit absolute fields are axes, single bit
+        fields are buttons. The sensor axes fall back to the usual ±127
+        limits when no report has them.
+
+        :param fields:  Input report fields of the device endpoints
+        '''
+        axes: Dict[str, Axis] = {}
+        for field in fields:
+            if field.relative or field.size > 1:
+                axes.setdefault(field.attr, Axis(field.attr, field.logical_min,
+                                                 field.logical_max, field.relative))
+
+        for axis in DEFAULT_AXES:
+            axes.setdefault(axis.attr, axis)
+
+        return cls(list(axes.values()))
+
+    def plan(self, data: Dict[str, int], packets: List[EventData],
+             profile: Optional[MotionProfile] = None) -> None:
+        '''
+        Plans the movement of the axes
+
+        Relative axes move by the given number of counts, absolute axes move
+        to the given position. Absolute axes not in the data hold their
+        position.
+
+        The sensor axes follow the motion profile, the remaining axes use
+        its easing on a straight line, without noise.
+
+        :param data:        Movement of each axis (counts)
+        :param packets:     Packets to fill, one for each report slot
+        :param profile:     Motion profile
+        '''
+        for attr, value in data.items():
+            assert attr in self.axes, f'unknown axis {attr}'
+            axis = self.axes[attr]
+            assert axis.relative or axis.logical_min <= value <= axis.logical_max, f'{attr} out of range'
+
+        profile = profile or MotionProfile()
+        moving = [attr for attr in self.axes if attr in data or attr in self.positions]
+        sensor = [attr for attr in SENSOR_AXES if attr in moving]
+        others = [attr for attr in moving if attr not in SENSOR_AXES]
+        order = sensor + others
+        if not order:
+            return
+
+        axes = [self.axes[attr] for attr in order]
+        start = np.array([self.positions.get(attr, 0) for attr in order])
+        # Absolute axes move from where they are to the given position
+        total = np.array([data.get(attr, self.positions.get(attr, 0)) for attr in order]) - start
+
+        count = len(packets)
+        positions = np.empty((count, len(order)))
+        if sensor:
+            positions[:, :len(sensor)] = profile.trajectory(total[:len(sensor)], count)
+        if others:
+            positions[:, len(sensor):] = MotionProfile(profile.easing).trajectory(total[len(sensor):], count)
+
+        relative = np.array([axis.relative for axis in axes])
+        axis_min = np.array([axis.logical_min for axis in axes])
+        axis_max = np.array([axis.logical_max for axis in axes])
+
+        values = np.empty((count, len(order)), dtype=np.int64)
+        if relative.any():
+            values[:, relative] = quantize(positions[:, relative], axis_min[relative], axis_max[relative])
+        if not relative.all():
+            absolute = ~relative
+            values[:, absolute] = np.rint(start[absolute] + positions[:, absolute])
+            for attr, position in zip(np.array(order)[absolute].tolist(), values[-1, absolute].tolist()):
+                self.positions[attr] = position
+
+        for packet, row in zip(packets, values.tolist()):
+            packet.__dict__.update(zip(order, row))
@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: MIT
+
+import atexit
+import logging
+import sys
+import threading
+import typing
+import weakref
+
+from typing import Any, Dict, List, Set
+
+if typing.TYPE_CHECKING:
+    from ratbag_emu.device import Device  # pragma: no cover
+
+
+RESOURCE_KEYS = ['fds', 'event_nodes', 'hidraw_nodes', 'buffered_reports', 'memory']
+
+# Only objects from these packages are considered part of a device when
+# approximating its memory, anything else is shared (e.g. pyudev contexts)
+_OWNED_MODULES = ('ratbag_emu', 'hidtools')
+
+
+def approximate_size(obj: Any, seen: Set[int]) -> int:
+    '''
+    Approximates the memory used by an object and everything it holds
+
+    :param obj:     Object
+    :param seen:    Ids of the objects already accounted for
+    '''
+    if id(obj) in seen or isinstance(obj, (type, logging.Logger, threading.Thread)):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approximate_size(k, seen) + approximate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item, seen) for item in obj)
+    elif type(obj).__module__.startswith(_OWNED_MODULES) and hasattr(obj, '__dict__'):
+        size += approximate_size(vars(obj), seen)
+    return size
+
+
+class DeviceRegistry(object):
+    '''
+    Keeps track of the live devices
+
+    Devices are held by weak references, so the registry doesn't keep them
+    alive. Devices which were not destroyed when the interpreter exits are
+    reported as leaked.
+    '''
+    def __init__(self) -> None:
+        self.__logger = logging.getLogger('ratbag-emu.registry')
+
+        self._devices: 'weakref.WeakSet[Device]' = weakref.WeakSet()
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def register(self, device: 'Device') -> None:
+        self._devices.add(device)
+
+    def unregister(self, device: 'Device') -> None:
+        self._devices.discard(device)
+
+    @property
+    def devices(self) -> List['Device']:
+        return list(self._devices)
+
+    def resources(self) -> Dict[str, Dict[str, int]]:
+        '''
+        Returns the resources held by each live device, by name
+        '''
+        return {device.name: device.resources() for device in self.devices}
+
+    def totals(self) -> Dict[str, int]:
+        '''
+        Returns the resources held by all live devices
+        '''
+        totals = {key: 0 for key in RESOURCE_KEYS}
+        for resources in self.resources().values():
+            for key in RESOURCE_KEYS:
+                totals[key] += resources[key]
+        totals['devices'] = len(self)
+        totals['threads'] = threading.active_count()
+        return totals
+
+    def destroy_all(self) -> int:
+        '''
+        Destroys all live devices
+
+        Returns the number of destroyed devices.
+        '''
+        devices = self.devices
+        for device in devices:
+            device.destroy()
+        return len(devices)
+
+    def report_leaks(self) -> None:
+        '''
+        Logs the devices which were never destroyed
+        '''
+        resources = self.resources()
+        if not resources:
+            return
+
+        self.__logger.warning(f'{len(resources)} device(s) were never destroyed:')
+        for name, res in resources.items():
+            self.__logger.warning(f'  {name}: ' + ', '.join(f'{key}={res[key]}' for key in RESOURCE_KEYS))
+
+
+registry = DeviceRegistry()
+atexit.register(registry.report_leaks)
@@ -0,0 +1,255 @@
+# SPDX-License-Identifier: MIT
+
+import copy
+import logging
+import typing
+import weakref
+
+from typing import Any, Dict, Iterable, List, Set, Tuple, Union
+
+if typing.TYPE_CHECKING:
+    from ratbag_emu.device import Device  # pragma: no cover
+
+
+def _unchanged(value: Any, other: Any) -> bool:
+    '''
+    Returns whether two values are known to be equal
+
+    Values which can't be compared, or whose comparison isn't a plain bool
+    (e.g. numpy arrays), are considered changed.
+    '''
+    if value is other:
+        return True
+    try:
+        equal = value == other
+    except Exception:
+        return False
+    return equal if isinstance(equal, bool) else False
+
+
+class MemorySnapshot(object):
+    '''
+    Represents a snapshot of a :class:`PagedMemory`
+
+    :param pages:       Pages at the time of the snapshot
+    :param position:    Position in the memory journal
+    '''
+    def __init__(self, pages: Tuple[bytes, ...], position: int):
+        self.pages = pages
+        self.position = position
+
+
+class PagedMemory(object):
+    '''
+    Represents a memory image with copy-on-write pages
+
+    The memory is split into immutable pages. Writing to the memory replaces
+    the affected pages, so snapshots only need to hold references to the
+    pages and share the unchanged ones. Restoring a snapshot only touches
+    the pages that were modified since it was taken.
+
+    Firmware implementations should keep large state, like the onboard
+    memory, in this object so that snapshots stay cheap.
+
+    :param data:        Initial data, or size of the zeroed memory
+    :param page_size:   Page size
+    '''
+    def __init__(self, data: Union[int, bytes, Iterable[int]] = 0, page_size: int = 256):
+        if isinstance(data, int):
+            data = bytes(data)
+        data = bytes(data)
+
+        self._page_size = page_size
+        self._size = len(data)
+        self._pages: List[bytes] = [data[i:i + page_size] for i in range(0, len(data), page_size)]
+
+        # Journal of the pages changed since each snapshot was taken, the
+        # entries before the oldest live snapshot are trimmed
+        self._journal: List[int] = []
+        self._journal_start = 0
+        self._dirty: Set[int] = set()
+        self._snapshots: 'weakref.WeakSet[MemorySnapshot]' = weakref.WeakSet()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _range(self, key: Union[int, slice]) -> Tuple[int, int]:
+        if isinstance(key, slice):
+            start, stop, stride = key.indices(self._size)
+            assert stride == 1
+            return start, max(start, stop)
+
+        if key < 0:
+            key += self._size
+        if not 0 <= key < self._size:
+            raise IndexError('memory index out of range')
+        return key, key + 1
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[int, bytes]:
+        start, stop = self._range(key)
+        data = b''.join(self._pages[start // self._page_size:(stop - 1) // self._page_size + 1])
+        offset = start - start % self._page_size
+        data = data[start - offset:stop - offset]
+
+        if isinstance(key, slice):
+            return data
+        return data[0]
+
+    def __setitem__(self, key: Union[int, slice], value: Union[int, bytes, Iterable[int]]) -> None:
+        start, stop = self._range(key)
+        value = bytes([value]) if isinstance(value, int) else bytes(value)
+        assert len(value) == stop - start
+
+        while start < stop:
+            index = start // self._page_size
+            offset = start % self._page_size
+            length = min(self._page_size - offset, stop - start)
+
+            page = bytearray(self._pages[index])
+            page[offset:offset + length] = value[:length]
+            self._set_page(index, bytes(page))
+
+            value = value[length:]
+            start += length
+
+    def _set_page(self, index: int, page: bytes) -> None:
+        self._pages[index] = page
+        if index not in self._dirty:
+            self._dirty.add(index)
+            self._journal.append(index)
+
+    def to_bytes(self) -> bytes:
+        return b''.join(self._pages)
+
+    def _trim_journal(self) -> None:
+        end = self._journal_start + len(self._journal)
+        oldest = min((snap.position for snap in self._snapshots), default=end)
+        del self._journal[:oldest - self._journal_start]
+        self._journal_start = oldest
+
+    def snapshot(self) -> MemorySnapshot:
+        '''
+        Takes a snapshot of the memory
+
+        The snapshot only holds references to the current pages.
+        '''
+        self._trim_journal()
+        self._dirty = set()
+        snap = MemorySnapshot(tuple(self._pages), self._journal_start + len(self._journal))
+        self._snapshots.add(snap)
+        return snap
+
+    def restore(self, snap: MemorySnapshot) -> None:
+        '''
+        Restores a snapshot of the memory
+
+        Only the pages changed since the snapshot was taken are restored.
+
+        :param snap:    Snapshot
+        '''
+        for index in set(self._journal[snap.position - self._journal_start:]):
+            if self._pages[index] is not snap.pages[index]:
+                self._set_page(index, snap.pages[index])
+
+
+class Snapshot(object):
+    '''
+    Represents a snapshot of the state of an object
+
+    Values which implement ``snapshot()`` and ``restore()`` (like
+    :class:`PagedMemory`) are snapshotted themselves, everything else is
+    copied. Values equal to the ones in the previous snapshot of the object
+    reuse its copy, and immutable values are not actually copied, so
+    unchanged state is shared by all snapshots.
+
+    :param obj:     Object
+    :param exclude: Attributes which should not be part of the snapshot
+    '''
+    # Previous snapshot of each object, by id, objects may not be hashable
+    _previous: Dict[int, Tuple['weakref.ref[Any]', 'Snapshot']] = {}
+
+    def __init__(self, obj: object, exclude: Iterable[str] = ()):
+        self.state: Dict[str, Any] = {}
+        self.nested: Dict[str, Tuple[Any, Any]] = {}
+
+        ref, previous = Snapshot._previous.get(id(obj), (None, None))
+        if ref is None or ref() is not obj:
+            previous = None
+        for attr, value in vars(obj).items():
+            if attr in exclude or isinstance(value, logging.Logger):
+                continue
+            if hasattr(value, 'snapshot') and hasattr(value, 'restore'):
+                self.nested[attr] = (value, value.snapshot())
+            elif previous and attr in previous.state and _unchanged(previous.state[attr], value):
+                self.state[attr] = previous.state[attr]
+            else:
+                self.state[attr] = copy.deepcopy(value)
+
+        key = id(obj)
+        try:
+            ref = weakref.ref(obj, lambda r: Snapshot._previous.pop(key, None))
+        except TypeError:
+            pass  # objects without weakref support don't share state
+        else:
+            Snapshot._previous[key] = (ref, self)
+
+    def restore(self, obj: object) -> None:
+        '''
+        Restores the snapshot into the object
+
+        Values which did not change are left untouched.
+
+        :param obj:     Object
+        '''
+        current = vars(obj)
+
+        for attr, value in self.state.items():
+            if attr in current and _unchanged(current[attr], value):
+                continue
+            setattr(obj, attr, copy.deepcopy(value))
+
+        for attr, (value, snap) in self.nested.items():
+            if current.get(attr) is not value:
+                setattr(obj, attr, value)
+            value.restore(snap)
+
+
+class DeviceSnapshot(object):
+    '''
+    Represents a snapshot of the state of a device
+
+    Holds the report rate, the position of the absolute axes and the
+    snapshots of the hardware components, actuators and firmware.
+
+    :param device:  Device
+    '''
+    def __init__(self, device: 'Device'):
+        self.report_rate = device.report_rate
+        self.positions = device.planner.positions.copy()
+        self.hw = {name: (component, component.snapshot()) for name, component in device.hw.items()}
+        self.actuators = [(actuator, actuator.snapshot()) for actuator in device.actuators]
+        self.fw = (device.fw, device.fw.snapshot())
+
+    def restore(self, device: 'Device') -> None:
+        '''
+        Restores the snapshot into the device
+
+        :param device:  Device
+        '''
+        device.report_rate = self.report_rate
+        device.planner.positions.update(self.positions)
+
+        if device.hw.keys() != self.hw.keys() or \
+           any(device.hw[name] is not component for name, (component, _) in self.hw.items()):
+            device.hw = {name: component for name, (component, _) in self.hw.items()}
+        for component, snap in self.hw.values():
+            component.restore(snap)
+
+        if [actuator for actuator, _ in self.actuators] != device.actuators:
+            device.actuators = [actuator for actuator, _ in self.actuators]
+        for actuator, snap in self.actuators:
+            actuator.restore(snap)
+
+        fw, snap = self.fw
+        device.fw = fw
+        fw.restore(snap)
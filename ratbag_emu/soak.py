@@ -0,0 +1,367 @@
+# SPDX-License-Identifier: MIT
+
+import argparse
+import collections
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import sched
+import sys
+import time
+import typing
+
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from ratbag_emu.util import ActionType, EventData, mm2inch
+
+if typing.TYPE_CHECKING:
+    from ratbag_emu.device import Device  # pragma: no cover
+
+
+GENERIC_MOUSE_RDESC = [
+    0x05, 0x01,  # .Usage Page (Generic Desktop)        0
+    0x09, 0x02,  # .Usage (Mouse)                       2
+    0xa1, 0x01,  # .Collection (Application)            4
+    0x09, 0x02,  # ..Usage (Mouse)                      6
+    0xa1, 0x02,  # ..Collection (Logical)               8
+    0x09, 0x01,  # ...Usage (Pointer)                   10
+    0xa1, 0x00,  # ...Collection (Physical)             12
+    0x05, 0x09,  # ....Usage Page (Button)              14
+    0x19, 0x01,  # ....Usage Minimum (1)                16
+    0x29, 0x03,  # ....Usage Maximum (3)                18
+    0x15, 0x00,  # ....Logical Minimum (0)              20
+    0x25, 0x01,  # ....Logical Maximum (1)              22
+    0x75, 0x01,  # ....Report Size (1)                  24
+    0x95, 0x03,  # ....Report Count (3)                 26
+    0x81, 0x02,  # ....Input (Data,Var,Abs)             28
+    0x75, 0x05,  # ....Report Size (5)                  30
+    0x95, 0x01,  # ....Report Count (1)                 32
+    0x81, 0x03,  # ....Input (Cnst,Var,Abs)             34
+    0x05, 0x01,  # ....Usage Page (Generic Desktop)     36
+    0x09, 0x30,  # ....Usage (X)                        38
+    0x09, 0x31,  # ....Usage (Y)                        40
+    0x15, 0x81,  # ....Logical Minimum (-127)           42
+    0x25, 0x7f,  # ....Logical Maximum (127)            44
+    0x75, 0x08,  # ....Report Size (8)                  46
+    0x95, 0x02,  # ....Report Count (2)                 48
+    0x81, 0x06,  # ....Input (Data,Var,Rel)             50
+    0xc0,        # ...End Collection                    52
+    0xc0,        # ..End Collection                     53
+    0xc0,        # .End Collection                      54
+]
+
+STAT_KEYS = ['actions', 'reports', 'idle', 'late', 'errors']
+
+
+def load_script(path: str) -> List[Dict[str, Any]]:
+    '''
+    Loads a scripted action stream
+
+    The script is a JSON list of actions, in the same format accepted by
+    :meth:`ratbag_emu.Device.simulate_action`, except for the action type,
+    which is given by its name (e.g. ``"XY"``).
+
+    :param path:    Script path
+    '''
+    with open(path) as f:
+        actions = json.load(f)
+
+    for action in actions:
+        action['type'] = ActionType[action['type']]
+
+    return actions
+
+
+def _random_actions(dpi: int, report_rate: int, axis_max: Dict[str, int],
+                    rng: random.Random) -> Iterator[Dict[str, Any]]:
+    while True:
+        duration = rng.randint(10, 500)
+        report_count = max(int(round(duration / 1000 * report_rate)), 1)
+        # Stay below the maximum the device can move in report_count reports
+        max_mm = {attr: limit * report_count / (mm2inch(1) * dpi) * 0.9 for attr, limit in axis_max.items()}
+        yield {
+            'type': ActionType.XY,
+            'duration': duration,
+            'data': {attr: rng.uniform(-limit, limit) for attr, limit in max_mm.items()},
+        }
+
+
+def _scripted_actions(script: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    while True:
+        yield from script
+
+
+class SoakDevice(object):
+    '''
+    Represents a device driven by a soak worker
+
+    Sends one report per report slot, pulling the next action from the
+    action stream when the current one is exhausted.
+
+    :param device:      Device
+    :param actions:     Action stream
+    :param start:       Time of the first report slot
+    '''
+    def __init__(self, device: 'Device', actions: Iterator[Dict[str, Any]], start: float):
+        self.device = device
+        self.actions = actions
+        self.start = start
+        self.slot = 0
+        self.packets: Deque[EventData] = collections.deque()
+        self.stats: Dict[str, Any] = {key: 0 for key in STAT_KEYS}
+        self.stats['max_lateness'] = 0.0
+
+    def next_time(self) -> float:
+        return self.start + self.slot / self.device.report_rate
+
+    def tick(self, now: float) -> None:
+        lateness = now - self.next_time()
+        if lateness > 1 / self.device.report_rate:
+            self.stats['late'] += 1
+        self.stats['max_lateness'] = max(self.stats['max_lateness'], lateness)
+
+        if not self.packets:
+            self.packets.extend(self.device.plan_action(next(self.actions)))
+            self.stats['actions'] += 1
+
+        packet = self.packets.popleft()
+        try:
+            if any(vars(packet).values()):
+                self.device.send_hid_action(packet)
+                self.stats['reports'] += 1
+            else:
+                self.stats['idle'] += 1
+        except OSError:
+            self.stats['errors'] += 1
+
+        self.slot += 1
+
+
+def _create_soak_device(spec: Dict[str, Any], script: Optional[List[Dict[str, Any]]],
+                        rng: random.Random) -> SoakDevice:
+    from ratbag_emu.actuators import SensorActuator
+    from ratbag_emu.device import Device
+
+    device = Device(spec['name'], spec['info'], spec['rdescs'])
+    device.report_rate = spec['report_rate']
+    device.actuators = [SensorActuator(spec['dpi'])]
+
+    if script is not None:
+        actions = _scripted_actions(script)
+    else:
+        axis_max = {attr: min(-device.planner.axes[attr].logical_min, device.planner.axes[attr].logical_max)
+                    for attr in ['x', 'y']}
+        actions = _random_actions(spec['dpi'], spec['report_rate'], axis_max, rng)
+
+    return SoakDevice(device, actions, 0.0)
+
+
+def _worker(worker_id: int, specs: List[Dict[str, Any]], duration: float, interval: float,
+            script: Optional[List[Dict[str, Any]]], seed: Optional[int],
+            results: 'multiprocessing.Queue[Tuple[str, int, Any]]') -> None:
+    # Only the workers need uhid, the runner doesn't import it
+    import hidtools.uhid
+
+    logger = logging.getLogger('ratbag-emu.soak')
+    rng = random.Random(None if seed is None else seed + worker_id)
+    soak_devices: List[SoakDevice] = []
+
+    try:
+        for spec in specs:
+            soak_devices.append(_create_soak_device(spec, script, rng))
+
+        s = sched.scheduler(time.monotonic, time.sleep)
+        start = time.monotonic()
+        end = start + duration
+
+        def stats() -> Dict[str, Dict[str, Any]]:
+            return {d.device.name: dict(d.stats) for d in soak_devices}
+
+        def tick(soak_device: SoakDevice) -> None:
+            soak_device.tick(time.monotonic())
+            if soak_device.next_time() < end:
+                s.enterabs(soak_device.next_time(), 1, tick, argument=(soak_device,))
+
+        def housekeeping() -> None:
+            hidtools.uhid.UHIDDevice.dispatch(0)
+            results.put(('stats', worker_id, stats()))
+            if time.monotonic() + interval < end:
+                s.enter(interval, 0, housekeeping)
+
+        for soak_device in soak_devices:
+            soak_device.start = start
+            s.enterabs(start, 1, tick, argument=(soak_device,))
+        s.enter(interval, 0, housekeeping)
+        s.run()
+
+        results.put(('done', worker_id, stats()))
+    except Exception as e:
+        logger.exception(f'worker {worker_id} failed')
+        results.put(('error', worker_id, str(e)))
+    finally:
+        for soak_device in soak_devices:
+            soak_device.device.destroy()
+
+
+class SoakRunner(object):
+    '''
+    Runs a fleet of emulated devices across several worker processes
+
+    A single process quickly becomes bound by the GIL when driving many
+    devices, so the fleet is sharded across workers. Each worker owns its
+    devices and streams their statistics back to the runner, which
+    aggregates them.
+
+    :param workers:     Number of worker processes
+    :param devices:     Number of devices
+    :param report_rate: Report rate of each device
+    :param duration:    Duration of the run (seconds)
+    :param dpi:         DPI of each device
+    :param rdescs:      Report descriptors of each device
+    :param script:      Scripted action stream, random actions are used if None
+    :param seed:        Seed for the random action streams
+    :param interval:    Interval between statistics updates (seconds)
+    '''
+    def __init__(self, workers: int, devices: int, report_rate: int = 1000, duration: float = 10.0,
+                 dpi: int = 1000, rdescs: Optional[List[List[int]]] = None,
+                 script: Optional[List[Dict[str, Any]]] = None, seed: Optional[int] = None,
+                 interval: float = 1.0):
+        self.__logger = logging.getLogger('ratbag-emu.soak')
+
+        self.workers = max(min(workers, devices), 1)
+        self.devices = devices
+        self.report_rate = report_rate
+        self.duration = duration
+        self.dpi = dpi
+        self.rdescs = rdescs or [GENERIC_MOUSE_RDESC]
+        self.script = script
+        self.seed = seed
+        self.interval = interval
+
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def shards(self) -> List[List[Dict[str, Any]]]:
+        '''
+        Splits the device fleet between the workers
+        '''
+        shards: List[List[Dict[str, Any]]] = [[] for i in range(self.workers)]
+        for i in range(self.devices):
+            shards[i % self.workers].append({
+                'name': f'Soak Device {i}',
+                'info': (0x03, 0x9999, 0x9999),
+                'rdescs': self.rdescs,
+                'report_rate': self.report_rate,
+                'dpi': self.dpi,
+            })
+        return shards
+
+    def summary(self) -> Dict[str, Any]:
+        '''
+        Aggregates the statistics of all devices
+        '''
+        summary: Dict[str, Any] = {key: 0 for key in STAT_KEYS}
+        summary['max_lateness'] = 0.0
+        for stats in self.stats.values():
+            for key in STAT_KEYS:
+                summary[key] += stats[key]
+            summary['max_lateness'] = max(summary['max_lateness'], stats['max_lateness'])
+        summary['devices'] = len(self.stats)
+        summary['reports_per_second'] = summary['reports'] / self.duration
+        return summary
+
+    def _collect(self, results: 'multiprocessing.Queue[Tuple[str, int, Any]]',
+                 processes: List[multiprocessing.Process]) -> List[str]:
+        '''
+        Collects the statistics streamed by the workers until all are done
+
+        :param results:     Queue the workers report to
+        :param processes:   Worker processes
+        '''
+        pending = set(range(len(processes)))
+        errors = []
+        while pending:
+            try:
+                kind, worker_id, data = results.get(timeout=self.interval)
+            except queue.Empty:
+                for worker_id in list(pending):
+                    if not processes[worker_id].is_alive():
+                        errors.append(f'worker {worker_id} exited with code {processes[worker_id].exitcode}')
+                        pending.discard(worker_id)
+                continue
+
+            if kind == 'error':
+                errors.append(f'worker {worker_id}: {data}')
+                pending.discard(worker_id)
+                continue
+
+            self.stats.update(data)
+            if kind == 'done':
+                pending.discard(worker_id)
+            self.__logger.debug(f'worker {worker_id}: {len(data)} devices, '
+                                f'{sum(d["reports"] for d in data.values())} reports')
+
+        return errors
+
+    def run(self) -> Dict[str, Any]:
+        '''
+        Runs the soak test and returns the aggregated statistics
+        '''
+        results: 'multiprocessing.Queue[Tuple[str, int, Any]]' = multiprocessing.Queue()
+        processes = []
+        for worker_id, shard in enumerate(self.shards()):
+            process = multiprocessing.Process(target=_worker,
+                                              args=(worker_id, shard, self.duration, self.interval,
+                                                    self.script, self.seed, results))
+            process.start()
+            processes.append(process)
+
+        errors = self._collect(results, processes)
+
+        for process in processes:
+            process.join()
+
+        if errors:
+            raise RuntimeError('; '.join(errors))
+
+        return self.summary()
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Soak test a fleet of emulated devices')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='number of worker processes')
+    parser.add_argument('--devices', type=int, default=1,
+                        help='number of emulated devices')
+    parser.add_argument('--report-rate', type=int, default=1000,
+                        help='report rate of each device (Hz)')
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help='duration of the run (seconds)')
+    parser.add_argument('--dpi', type=int, default=1000,
+                        help='DPI of each device')
+    parser.add_argument('--script', type=str,
+                        help='JSON file with the action stream, defaults to random actions')
+    parser.add_argument('--seed', type=int,
+                        help='seed for the random action streams')
+    parser.add_argument('--per-device', action='store_true',
+                        help='also print the statistics of each device')
+    options = parser.parse_args(args)
+
+    runner = SoakRunner(options.workers, options.devices,
+                        report_rate=options.report_rate,
+                        duration=options.duration,
+                        dpi=options.dpi,
+                        script=load_script(options.script) if options.script else None,
+                        seed=options.seed)
+    summary = runner.run()
+    if options.per_device:
+        summary['per_device'] = runner.stats
+
+    json.dump(summary, sys.stdout, indent=4)
+    print()
+
+
+if __name__ == '__main__':
+    main()  # pragma: no cover
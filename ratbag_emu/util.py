@@ -1,7 +1,33 @@
 # SPDX-License-Identifier: MIT
 
+import importlib
+import sys
+
 from enum import Enum
-from typing import Any, Dict, Union
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+
+def lazy_import(module: str, attrs: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    '''
+    Creates the module __getattr__ and __dir__ for lazy loading
+
+    The attributes are only imported from their submodules when first
+    accessed.
+
+    :param module:  Module name
+    :param attrs:   Submodule of each attribute, relative to the module
+    '''
+    def __getattr__(name: str) -> Any:
+        if name not in attrs:
+            raise AttributeError(f'module {module!r} has no attribute {name!r}')
+        value = getattr(importlib.import_module(attrs[name], module), name)
+        setattr(sys.modules[module], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[module])) | set(attrs))
+
+    return __getattr__, __dir__
 
 
 def mm2inch(mm: Union[int, float]) -> float:
@@ -31,6 +57,24 @@ class EventData(object):
                          y=int(round(mm2inch(action['data']['y']) * dpi)))
 
 
+class SimulationStats(object):
+    '''
+    Represents the statistics of a simulated action
+
+    Reports only counts the non-empty reports sent, late counts the report
+    slots we were more than one slot late for, and coalesced counts the
+    reports merged into the following one.
+
+    :param slots:   Number of report slots
+    '''
+    def __init__(self, slots: int):
+        self.slots = slots
+        self.reports = 0
+        self.late = 0
+        self.coalesced = 0
+
+
 class ActionType(Enum):
     XY = 1
     BUTTON = 2
+    AXES = 3
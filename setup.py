@@ -38,7 +38,15 @@ setup(
         'ratbag_emu',
         'ratbag_emu.actuators',
     ],
-    install_requires=['hid-tools'],
+    package_data={
+        'ratbag_emu': ['devices/*.json'],
+    },
+    install_requires=['hid-tools', 'numpy>=1.17'],
+    entry_points={
+        'console_scripts': [
+            'ratbag-emu-soak=ratbag_emu.soak:main',
+        ],
+    },
     tests_require=[
         'pytest',
         'libevdev',
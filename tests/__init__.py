@@ -71,6 +71,7 @@ class TestBase(object):
     @pytest.fixture()
     def event_data(self, libevdev_event_nodes):
         received = EventData()
+        received.wheel = received.hwheel = 0
         def collect_events(stop):  # noqa: 306
             nonlocal received
             while not stop.is_set():
@@ -80,6 +81,10 @@ class TestBase(object):
                             received.x += e.value
                         elif e.matches(libevdev.EV_REL.REL_Y):
                             received.y += e.value
+                        elif e.matches(libevdev.EV_REL.REL_WHEEL):
+                            received.wheel += e.value
+                        elif e.matches(libevdev.EV_REL.REL_HWHEEL):
+                            received.hwheel += e.value
                 sleep(0.001)
 
         stop_event_thread = threading.Event()
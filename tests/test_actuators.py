@@ -1,6 +1,6 @@
 # SPDX-License-Identifier: MIT
 
-from ratbag_emu.actuators import SensorActuator
+from ratbag_emu.actuators import AxisActuator, SensorActuator
 
 from tests.test_device import TestDeviceBase
 
@@ -20,3 +20,20 @@ class TestSensorActuator(TestDeviceBase):
 
         assert hid_data['x'] == 197
         assert hid_data['y'] == 118
+
+
+class TestAxisActuator(TestDeviceBase):
+    def test_transform(self):
+        actuator = AxisActuator(['wheel', 'acpan'], multiplier=8)
+
+        data = {
+            'wheel': -2,
+            'acpan': 1,
+            'x': 5,
+        }
+
+        hid_data = actuator.transform(data)
+
+        assert hid_data['wheel'] == -16
+        assert hid_data['acpan'] == 8
+        assert hid_data['x'] == 5
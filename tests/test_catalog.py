@@ -0,0 +1,100 @@
+# SPDX-License-Identifier: MIT
+
+import json
+
+import pytest
+
+from ratbag_emu.actuators import SensorActuator
+from ratbag_emu.catalog import Catalog
+from ratbag_emu.hardware import LedComponent
+
+from tests.test_device import TestDeviceBase
+
+
+class TestCatalog(TestDeviceBase):
+    @pytest.fixture()
+    def catalog_dir(self, tmp_path):
+        path = tmp_path / 'devices'
+        path.mkdir()
+        for i in range(3):
+            (path / f'mouse-{i}.json').write_text(json.dumps({
+                'name': f'{self.name} {i}',
+                'vid': f'0x{self.vid:04x}',
+                'pid': self.pid + i,
+                'rdescs': self.rdescs,
+                'report_rate': 500,
+                'actuators': [{'class': 'SensorActuator', 'dpi': 1200}],
+                'hw': {'led': {'class': 'LedComponent', 'state': False}},
+            }))
+        return path
+
+    def test_index(self, catalog_dir, tmp_path):
+        catalog = Catalog([catalog_dir], cache_dir=tmp_path / 'cache')
+
+        assert len(catalog) == 3
+        assert catalog.find(self.vid, self.pid + 1) == [f'{self.name} 1']
+        assert catalog.find(self.vid, self.pid + 1, bus=0x05) == []
+        assert (tmp_path / 'cache' / 'index.json').is_file()
+
+    def test_index_unchanged(self, catalog_dir, tmp_path):
+        Catalog([catalog_dir], cache_dir=tmp_path / 'cache').index
+        index_file = tmp_path / 'cache' / 'index.json'
+        mtime = index_file.stat().st_mtime_ns
+
+        Catalog([catalog_dir], cache_dir=tmp_path / 'cache').index
+
+        assert index_file.stat().st_mtime_ns == mtime
+
+    def test_read_only_cache(self, catalog_dir, tmp_path):
+        cache_dir = tmp_path / 'cache'
+        cache_dir.write_text('not a directory')
+
+        catalog = Catalog([catalog_dir], cache_dir=cache_dir)
+
+        assert len(catalog) == 3
+        assert catalog.get(f'{self.name} 0').compiled[0].encoder
+
+    def test_duplicated_name(self, catalog_dir):
+        (catalog_dir / 'mouse-3.json').write_text((catalog_dir / 'mouse-0.json').read_text())
+
+        with pytest.raises(ValueError):
+            Catalog([catalog_dir], use_cache=False).index
+
+    def test_lazy_load(self, catalog_dir, tmp_path):
+        catalog = Catalog([catalog_dir], cache_dir=tmp_path / 'cache')
+
+        assert f'{self.name} 0' in catalog
+        assert not catalog._models
+
+        model = catalog.get(f'{self.name} 0')
+
+        assert model.info == (0x03, self.vid, self.pid)
+        assert model.rdescs == self.rdescs
+        assert list(catalog._models) == [f'{self.name} 0']
+
+    def test_artifacts(self, catalog_dir, tmp_path):
+        cache_dir = tmp_path / 'cache'
+        compiled = Catalog([catalog_dir], cache_dir=cache_dir).get(f'{self.name} 0').compiled
+
+        assert len(list(cache_dir.glob('rdesc-*.pickle'))) == 1
+
+        cached = Catalog([catalog_dir], cache_dir=cache_dir).get(f'{self.name} 1').compiled
+
+        assert cached[0].parsed.bytes == compiled[0].parsed.bytes == self.rdescs[0]
+        assert [f.attr for f in cached[0].encoder.fields] == ['b1', 'b2', 'b3', 'x', 'y']
+
+    def test_create(self, catalog_dir):
+        catalog = Catalog([catalog_dir], use_cache=False)
+
+        device = catalog.create(f'{self.name} 2')
+
+        try:
+            assert device.info == (0x03, self.vid, self.pid + 2)
+            assert device.rdescs == self.rdescs
+            assert device.report_rate == 500
+            assert isinstance(device.actuators[0], SensorActuator)
+            assert device.actuators[0].dpi == 1200
+            assert isinstance(device.hw['led'], LedComponent)
+            assert not device.hw['led'].state
+        finally:
+            device.destroy()
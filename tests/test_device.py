@@ -117,6 +117,45 @@ class TestDevice(TestDeviceBase):
         assert event_data.x == expected.x
         assert event_data.y == expected.y
 
+    def test_movement_coalesce(self, device, event_data, monkeypatch):
+        '''
+        Test mouse movement when we fall behind schedule
+        '''
+        dpi = 1000
+
+        device.report_rate = 1000
+        device.actuators += [
+            SensorActuator(dpi)
+        ]
+
+        send_hid_action = device.send_hid_action
+
+        def slow_send_hid_action(action):
+            send_hid_action(action)
+            time.sleep(0.003)
+
+        monkeypatch.setattr(device, 'send_hid_action', slow_send_hid_action)
+
+        action = {
+            'type': ActionType.XY,
+            'duration': 200,
+            'data': {
+                'x': 5,
+                'y': 2
+            }
+        }
+
+        stats = device.simulate_action(action, coalesce=True)
+        time.sleep(0.1)  # give time for the kernel to proccess all events
+
+        expected = EventData.from_action(dpi, action)
+
+        assert stats.late > 0
+        assert stats.coalesced > 0
+        assert stats.reports < stats.slots
+        assert event_data.x == expected.x
+        assert event_data.y == expected.y
+
     def test_movement_max(self, device):
         '''
         Make sure we raise an error when we try to move more than possible
@@ -137,3 +176,58 @@ class TestDevice(TestDeviceBase):
 
         with pytest.raises(AssertionError):
             device.simulate_action(action)
+
+
+class TestReportIdDevice(TestDevice):
+    rdescs = [[
+        # Generic mouse report descriptor, with a report ID
+        0x05, 0x01,  # .Usage Page (Generic Desktop)        0
+        0x09, 0x02,  # .Usage (Mouse)                       2
+        0xa1, 0x01,  # .Collection (Application)            4
+        0x85, 0x01,  # ..Report ID (1)                      6
+        0x09, 0x01,  # ..Usage (Pointer)                    8
+        0xa1, 0x00,  # ..Collection (Physical)              10
+        0x05, 0x09,  # ...Usage Page (Button)               12
+        0x19, 0x01,  # ...Usage Minimum (1)                 14
+        0x29, 0x03,  # ...Usage Maximum (3)                 16
+        0x15, 0x00,  # ...Logical Minimum (0)               18
+        0x25, 0x01,  # ...Logical Maximum (1)               20
+        0x75, 0x01,  # ...Report Size (1)                   22
+        0x95, 0x03,  # ...Report Count (3)                  24
+        0x81, 0x02,  # ...Input (Data,Var,Abs)              26
+        0x75, 0x05,  # ...Report Size (5)                   28
+        0x95, 0x01,  # ...Report Count (1)                  30
+        0x81, 0x03,  # ...Input (Cnst,Var,Abs)              32
+        0x05, 0x01,  # ...Usage Page (Generic Desktop)      34
+        0x09, 0x30,  # ...Usage (X)                         36
+        0x09, 0x31,  # ...Usage (Y)                         38
+        0x15, 0x81,  # ...Logical Minimum (-127)            40
+        0x25, 0x7f,  # ...Logical Maximum (127)             42
+        0x75, 0x08,  # ...Report Size (8)                   44
+        0x95, 0x02,  # ...Report Count (2)                  46
+        0x81, 0x06,  # ...Input (Data,Var,Rel)              48
+        0xc0,        # ..End Collection                     50
+        0xc0,        # .End Collection                      51
+    ]]
+
+    def test_field_limits(self, device):
+        '''
+        Make sure the field limits don't need a precompiled encoder
+        '''
+        device.endpoints[0].encoder = None
+
+        limits = device._field_limits()
+
+        assert limits['x'] == limits['y'] == (True, -127, 127)
+        assert limits['b1'] == (False, 0, 1)
+
+    def test_encoder(self, device):
+        '''
+        Make sure numbered reports are precompiled too
+        '''
+        endpoint = device.endpoints[0]
+        assert endpoint.encoder is not None
+
+        action = EventData(5, -3)
+
+        assert endpoint.create_report(action) == endpoint.parsed_rdesc.create_report(action, None, 1)
@@ -0,0 +1,22 @@
+# SPDX-License-Identifier: MIT
+
+from ratbag_emu.util import EventData
+
+from tests.test_device import TestDeviceBase
+
+
+class TestFlood(TestDeviceBase):
+    def test_count(self, device):
+        result = device.flood([EventData(1, 0), EventData(-1, 0)], count=1000)
+
+        assert result.accepted == 1000
+        assert result.errors == 0
+        assert result.delivered + result.dropped == result.accepted
+        assert result.throughput > 0
+
+    def test_rate(self, device):
+        result = device.flood([EventData(1, 1)], duration=0.5, rate=2000, drain=False)
+
+        assert result.delivered is None
+        assert 0.5 <= result.duration < 1
+        assert 500 <= result.accepted <= 1000
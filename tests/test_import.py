@@ -0,0 +1,47 @@
+# SPDX-License-Identifier: MIT
+
+import json
+import subprocess
+import sys
+
+import ratbag_emu
+
+from tests import TestBase
+
+
+# Time budget (seconds) to import the modules which don't need uhid
+IMPORT_BUDGET = 0.15
+
+IMPORT_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import ratbag_emu, ratbag_emu.util, ratbag_emu.actuators, ratbag_emu.hardware, ratbag_emu.catalog
+from ratbag_emu.actuators import SensorActuator
+from ratbag_emu.hardware import LedComponent
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'elapsed': elapsed,
+    'modules': [m for m in ('hidtools', 'numpy', 'ratbag_emu.device', 'ratbag_emu.endpoint') if m in sys.modules],
+}))
+'''
+
+
+class TestImport(TestBase):
+    def import_stats(self):
+        out = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT], check=True, stdout=subprocess.PIPE).stdout
+        return json.loads(out)
+
+    def test_lazy(self):
+        stats = self.import_stats()
+
+        assert stats['modules'] == []
+
+    def test_budget(self):
+        # take the best of a few runs, to not fail on a busy machine
+        elapsed = min(self.import_stats()['elapsed'] for i in range(3))
+
+        assert elapsed < IMPORT_BUDGET
+
+    def test_attributes(self):
+        assert 'Device' in dir(ratbag_emu)
+        assert ratbag_emu.Device.__module__ == 'ratbag_emu.device'
@@ -0,0 +1,118 @@
+# SPDX-License-Identifier: MIT
+
+import time
+
+import numpy as np
+import pytest
+
+from ratbag_emu.actuators import SensorActuator
+from ratbag_emu.motion import MotionProfile, quantize
+from ratbag_emu.util import ActionType, EventData
+
+from tests.test_device import TestDeviceBase
+
+
+class TestMotionProfile(TestDeviceBase):
+    @pytest.mark.parametrize('easing', ['linear', 'ease-in', 'ease-out', 'ease-in-out'])
+    def test_trajectory(self, easing):
+        profile = MotionProfile(easing, control_points=[(0.25, 0.5), (0.75, -0.5)])
+
+        positions = profile.trajectory([197, -118], 100)
+
+        assert positions.shape == (100, 2)
+        assert np.allclose(positions[-1], [197, -118])
+
+    def test_linear(self):
+        positions = MotionProfile().trajectory([100, 50], 4)
+
+        assert np.allclose(positions, [[25, 12.5], [50, 25], [75, 37.5], [100, 50]])
+
+    def test_noise(self):
+        def trajectory():
+            profile = MotionProfile(jitter=2.0, dropout=0.3, seed=42)
+            return profile.trajectory([500, 500], 1000)
+
+        positions = trajectory()
+
+        assert np.array_equal(positions, trajectory())
+        assert np.allclose(positions[-1], [500, 500])
+        assert not np.allclose(positions, MotionProfile().trajectory([500, 500], 1000))
+
+    def test_quantize(self):
+        positions = MotionProfile().trajectory([197, 118], 1000)
+
+        deltas = quantize(positions, -127, 127)
+
+        assert deltas.sum(axis=0).tolist() == [197, 118]
+        assert set(np.unique(deltas)) <= {0, 1}
+
+    def test_quantize_clamp(self):
+        positions = np.array([[300.0], [300.0], [300.0], [301.0]])
+
+        deltas = quantize(positions, -127, 127)
+
+        assert deltas.ravel().tolist() == [127, 127, 46, 1]
+
+    def test_quantize_ease_in(self):
+        positions = MotionProfile('ease-in').trajectory([500, -500], 10)
+
+        deltas = quantize(positions, -127, 127)
+
+        assert deltas.sum(axis=0).tolist() == [500, -500]
+        assert np.abs(deltas).max() <= 127
+
+    @pytest.mark.parametrize('seed', range(20))
+    def test_quantize_dropout(self, seed):
+        positions = MotionProfile(dropout=0.3, seed=seed).trajectory([5000, -2000], 100)
+
+        deltas = quantize(positions, -127, 127)
+
+        assert deltas.sum(axis=0).tolist() == [5000, -2000]
+        assert np.abs(deltas).max() <= 127
+
+    def test_quantize_limit(self):
+        positions = MotionProfile('ease-in').trajectory([1270], 10)
+
+        assert quantize(positions, -127, 127).ravel().tolist() == [127] * 10
+
+    @pytest.mark.parametrize('easing', ['ease-in', 'ease-out', 'ease-in-out'])
+    def test_quantize_large(self, easing):
+        count = 64000
+        positions = MotionProfile(easing).trajectory([0.95 * 127 * count, -0.95 * 127 * count], count)
+
+        start = time.perf_counter()
+        deltas = quantize(positions, -127, 127)
+        elapsed = time.perf_counter() - start
+
+        assert deltas.sum(axis=0).tolist() == np.rint(positions[-1]).astype(int).tolist()
+        assert np.abs(deltas).max() <= 127
+        assert elapsed < 1.0
+
+    def test_quantize_max(self):
+        with pytest.raises(AssertionError):
+            quantize(np.array([[0.0], [300.0]]), -127, 127)
+
+    def test_curved_movement(self, device, event_data):
+        dpi = 1000
+
+        device.actuators += [
+            SensorActuator(dpi)
+        ]
+
+        action = {
+            'type': ActionType.XY,
+            'duration': 500,
+            'data': {
+                'x': 5,
+                'y': 5
+            },
+            'profile': MotionProfile('ease-in-out', control_points=[(0.3, 0.5), (0.7, 0.5)], jitter=0.5, seed=1)
+        }
+
+        device.simulate_action(action)
+        time.sleep(0.1)  # give time for the kernel to proccess all events
+
+        expected = EventData.from_action(dpi, action)
+
+        assert event_data.x == expected.x
+        assert event_data.y == expected.y
@@ -0,0 +1,175 @@
+# SPDX-License-Identifier: MIT
+
+import time
+
+import hidtools.hid
+import pytest
+
+from ratbag_emu import Device
+from ratbag_emu.actuators import AxisActuator, SensorActuator
+from ratbag_emu.encoder import input_fields
+from ratbag_emu.planner import Axis, Planner
+from ratbag_emu.util import ActionType, EventData
+
+from tests.test_device import TestDeviceBase
+
+
+WHEEL_MOUSE_RDESC = [
+    0x05, 0x01,        # .Usage Page (Generic Desktop)        0
+    0x09, 0x02,        # .Usage (Mouse)                       2
+    0xa1, 0x01,        # .Collection (Application)            4
+    0x09, 0x01,        # ..Usage (Pointer)                    6
+    0xa1, 0x00,        # ..Collection (Physical)              8
+    0x05, 0x09,        # ...Usage Page (Button)               10
+    0x19, 0x01,        # ...Usage Minimum (1)                 12
+    0x29, 0x03,        # ...Usage Maximum (3)                 14
+    0x15, 0x00,        # ...Logical Minimum (0)               16
+    0x25, 0x01,        # ...Logical Maximum (1)               18
+    0x95, 0x03,        # ...Report Count (3)                  20
+    0x75, 0x01,        # ...Report Size (1)                   22
+    0x81, 0x02,        # ...Input (Data,Var,Abs)              24
+    0x95, 0x01,        # ...Report Count (1)                  26
+    0x75, 0x05,        # ...Report Size (5)                   28
+    0x81, 0x03,        # ...Input (Cnst,Var,Abs)              30
+    0x05, 0x01,        # ...Usage Page (Generic Desktop)      32
+    0x16, 0x01, 0xf8,  # ...Logical Minimum (-2047)           34
+    0x26, 0xff, 0x07,  # ...Logical Maximum (2047)            37
+    0x75, 0x0c,        # ...Report Size (12)                  40
+    0x95, 0x02,        # ...Report Count (2)                  42
+    0x09, 0x30,        # ...Usage (X)                         44
+    0x09, 0x31,        # ...Usage (Y)                         46
+    0x81, 0x06,        # ...Input (Data,Var,Rel)              48
+    0x15, 0x81,        # ...Logical Minimum (-127)            50
+    0x25, 0x7f,        # ...Logical Maximum (127)             52
+    0x75, 0x08,        # ...Report Size (8)                   54
+    0x95, 0x01,        # ...Report Count (1)                  56
+    0x09, 0x38,        # ...Usage (Wheel)                     58
+    0x81, 0x06,        # ...Input (Data,Var,Rel)              60
+    0x05, 0x0c,        # ...Usage Page (Consumer Devices)     62
+    0x0a, 0x38, 0x02,  # ...Usage (AC Pan)                    64
+    0x95, 0x01,        # ...Report Count (1)                  67
+    0x81, 0x06,        # ...Input (Data,Var,Rel)              69
+    0xc0,              # ..End Collection                     71
+    0xc0,              # .End Collection                      72
+]
+
+
+class TestPlanner(TestDeviceBase):
+    @pytest.fixture()
+    def planner(self):
+        rdesc = hidtools.hid.ReportDescriptor.from_bytes(WHEEL_MOUSE_RDESC)
+        return Planner.from_fields(input_fields(rdesc))
+
+    def test_axes(self, planner):
+        axes = {attr: (axis.logical_min, axis.logical_max, axis.relative) for attr, axis in planner.axes.items()}
+
+        assert axes == {
+            'x': (-2047, 2047, True),
+            'y': (-2047, 2047, True),
+            'wheel': (-127, 127, True),
+            'acpan': (-127, 127, True),
+        }
+
+    def test_report_id(self):
+        # Same descriptor, with Report ID (1) after the application collection
+        rdesc = hidtools.hid.ReportDescriptor.from_bytes(WHEEL_MOUSE_RDESC[:6] + [0x85, 0x01] + WHEEL_MOUSE_RDESC[6:])
+        planner = Planner.from_fields(input_fields(rdesc))
+
+        assert (planner.axes['x'].logical_min, planner.axes['x'].logical_max) == (-2047, 2047)
+        assert (planner.axes['wheel'].logical_min, planner.axes['wheel'].logical_max) == (-127, 127)
+        assert 'acpan' in planner.axes
+
+    def test_default_axes(self):
+        planner = Planner.from_fields([])
+
+        assert list(planner.axes) == ['x', 'y']
+        assert planner.axes['x'].logical_max == 127
+
+    def test_plan(self, planner):
+        packets = [EventData() for _ in range(10)]
+
+        planner.plan({'x': 5000, 'y': -300, 'wheel': -3, 'acpan': 400}, packets)
+
+        for attr, total in [('x', 5000), ('y', -300), ('wheel', -3), ('acpan', 400)]:
+            values = [getattr(packet, attr) for packet in packets]
+            axis = planner.axes[attr]
+            assert sum(values) == total
+            assert all(axis.logical_min <= value <= axis.logical_max for value in values)
+
+    def test_plan_limits(self, planner):
+        with pytest.raises(AssertionError):
+            planner.plan({'wheel': 300}, [EventData(), EventData()])
+
+    def test_unknown_axis(self, planner):
+        with pytest.raises(AssertionError):
+            planner.plan({'z': 1}, [EventData()])
+
+    def test_absolute(self):
+        planner = Planner([Axis('z', 0, 1023, relative=False)])
+
+        packets = [EventData() for _ in range(4)]
+        planner.plan({'z': 800}, packets)
+        assert [packet.z for packet in packets] == [200, 400, 600, 800]
+
+        # Absolute axes hold their position
+        packets = [EventData() for _ in range(2)]
+        planner.plan({}, packets)
+        assert [packet.z for packet in packets] == [800, 800]
+
+        with pytest.raises(AssertionError):
+            planner.plan({'z': 2000}, packets)
+
+    def test_held_position(self):
+        device = Device(name=self.name, info=self.info, rdescs=[])
+        device.planner = Planner([Axis(attr, 0, 4095, relative=False) for attr in ['x', 'y']])
+        device.actuators = [AxisActuator(['x', 'y'])]
+
+        try:
+            device.plan_action({'type': ActionType.AXES, 'duration': 10, 'data': {'x': 1000, 'y': 500}})
+            packets = device.plan_action({'type': ActionType.BUTTON, 'duration': 10, 'data': {'id': 1}})
+        finally:
+            device.destroy()
+
+        assert vars(packets[0]) == {'x': 1000, 'y': 500, 'b1': 1}
+
+    def test_missing_actuator(self):
+        device = Device(name=self.name, info=self.info, rdescs=[])
+
+        try:
+            with pytest.raises(AssertionError):
+                device.plan_action({'type': ActionType.XY, 'duration': 10, 'data': {'x': 5, 'y': 5}})
+        finally:
+            device.destroy()
+
+
+class TestWheelDevice(TestDeviceBase):
+    rdescs = [WHEEL_MOUSE_RDESC]
+
+    def test_wheel(self, device, event_data):
+        dpi = 1000
+
+        device.actuators = [
+            SensorActuator(dpi),
+            AxisActuator(['wheel', 'acpan']),
+        ]
+
+        action = {
+            'type': ActionType.AXES,
+            'duration': 200,
+            'data': {
+                'x': 5,
+                'y': 5,
+                'wheel': -3,
+                'acpan': 2,
+            }
+        }
+
+        device.simulate_action(action)
+        time.sleep(0.1)  # give time for the kernel to proccess all events
+
+        expected = EventData.from_mm(dpi, 5, 5)
+
+        assert event_data.x == expected.x
+        assert event_data.y == expected.y
+        assert event_data.wheel == -3
+        assert event_data.hwheel == 2
@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: MIT
+
+import gc
+import logging
+
+import pytest
+
+from ratbag_emu import Device
+from ratbag_emu.registry import registry
+
+from tests.test_device import TestDeviceBase
+
+
+class TestRegistry(TestDeviceBase):
+    def test_register(self, device):
+        assert device in registry.devices
+        assert device.name in Device.device_list
+
+        device.destroy()
+
+        assert device not in registry.devices
+        assert device.name not in Device.device_list
+
+    def test_weak(self):
+        device = Device(name=self.name, info=self.info, rdescs=[])
+        assert len(registry) == 1
+
+        del device
+        gc.collect()
+
+        assert len(registry) == 0
+        assert self.name not in Device.device_list
+
+    def test_encoders_mismatch(self):
+        with pytest.raises(AssertionError):
+            Device(name=self.name, info=self.info, rdescs=self.rdescs, encoders=[])
+
+        assert len(registry) == 0
+        assert self.name not in Device.device_list
+
+    def test_failed_endpoint(self, monkeypatch):
+        created = []
+
+        class FailingEndpoint(object):
+            def __init__(self, owner, rdesc, number, encoder):
+                if number:
+                    raise OSError('no uhid')
+                self.destroyed = False
+                created.append(self)
+
+            def destroy(self):
+                self.destroyed = True
+
+        monkeypatch.setattr('ratbag_emu.device.Endpoint', FailingEndpoint)
+
+        with pytest.raises(OSError):
+            Device(name=self.name, info=self.info, rdescs=self.rdescs * 2)
+
+        assert [endpoint.destroyed for endpoint in created] == [True]
+        assert len(registry) == 0
+        assert self.name not in Device.device_list
+
+    def test_resources(self, device):
+        resources = device.resources()
+
+        assert resources['fds'] == 1
+        assert resources['event_nodes'] == len(device.event_nodes)
+        assert resources['hidraw_nodes'] == 1
+        assert resources['buffered_reports'] == 0
+        assert resources['memory'] > 0
+
+        totals = registry.totals()
+
+        assert totals['devices'] == 1
+        assert totals['fds'] == 1
+
+        device.destroy()
+
+        assert device.resources()['fds'] == 0
+
+    def test_destroy_all(self):
+        for i in range(3):
+            Device(name=f'{self.name} {i}', info=self.info, rdescs=self.rdescs)
+
+        assert registry.destroy_all() == 3
+        assert len(registry) == 0
+
+    def test_report_leaks(self, device, caplog):
+        with caplog.at_level(logging.WARNING, logger='ratbag-emu.registry'):
+            registry.report_leaks()
+
+        assert '1 device(s) were never destroyed' in caplog.text
+        assert device.name in caplog.text
@@ -0,0 +1,146 @@
+# SPDX-License-Identifier: MIT
+
+import dataclasses
+
+import numpy as np
+
+from ratbag_emu import Firmware, HWComponent
+from ratbag_emu.actuators import SensorActuator
+from ratbag_emu.hardware import LedComponent
+from ratbag_emu.snapshot import PagedMemory
+
+from tests.test_device import TestDeviceBase
+
+
+class MemoryFirmware(Firmware):
+    def __init__(self, owner):
+        super().__init__(owner)
+        self.profile = 0
+        self.memory = PagedMemory(4096, page_size=256)
+
+
+class ArrayFirmware(Firmware):
+    def __init__(self, owner):
+        super().__init__(owner)
+        self.registers = np.zeros(4)
+
+
+@dataclasses.dataclass(eq=True)
+class DataComponent(HWComponent):
+    level: int = 0
+
+
+class TestPagedMemory(TestDeviceBase):
+    def test_read_write(self):
+        memory = PagedMemory(1024, page_size=256)
+
+        memory[250:260] = range(10)
+        memory[-1] = 0xff
+
+        assert len(memory) == 1024
+        assert memory[250:260] == bytes(range(10))
+        assert memory[1023] == 0xff
+        assert memory.to_bytes()[250:260] == bytes(range(10))
+
+    def test_snapshot_shares_pages(self):
+        memory = PagedMemory(1024, page_size=256)
+
+        snap = memory.snapshot()
+        memory[0] = 1
+        other = memory.snapshot()
+
+        assert snap.pages[0] is not other.pages[0]
+        assert all(a is b for a, b in zip(snap.pages[1:], other.pages[1:]))
+
+    def test_journal_trim(self):
+        memory = PagedMemory(1024, page_size=256)
+
+        for i in range(100):
+            snap = memory.snapshot()
+            memory[0] = i
+            memory[300] = i
+
+        assert len(memory._journal) <= 4
+        memory.restore(snap)
+        assert memory[0] == memory[300] == 98
+
+    def test_restore(self):
+        memory = PagedMemory(b'\x00' * 1024, page_size=256)
+
+        first = memory.snapshot()
+        memory[0:4] = b'abcd'
+        second = memory.snapshot()
+        memory[600] = 1
+
+        memory.restore(first)
+        assert memory.to_bytes() == bytes(1024)
+
+        memory.restore(second)
+        assert memory[0:4] == b'abcd'
+        assert memory[600] == 0
+
+
+class TestDeviceSnapshot(TestDeviceBase):
+    def test_restore(self, device):
+        device.fw = MemoryFirmware(device)
+        device.hw['led'] = LedComponent(state=True)
+        device.actuators = [SensorActuator(dpi=1000)]
+
+        snap = device.snapshot()
+
+        device.report_rate = 1000
+        device.hw['led'].state = False
+        device.hw['other'] = LedComponent()
+        device.actuators[0].dpi = 2000
+        device.fw.profile = 3
+        device.fw.memory[100:104] = b'\xff' * 4
+
+        device.restore(snap)
+
+        assert device.report_rate == 100
+        assert list(device.hw) == ['led']
+        assert device.hw['led'].state
+        assert device.actuators[0].dpi == 1000
+        assert device.fw.profile == 0
+        assert device.fw.memory.to_bytes() == bytes(4096)
+
+    def test_shared_state(self, device):
+        device.fw = MemoryFirmware(device)
+        device.fw.profiles = {i: {'dpi': [800, 1600]} for i in range(16)}
+
+        first = device.snapshot()
+        second = device.snapshot()
+        device.fw.profiles[0]['dpi'] = [400]
+        third = device.snapshot()
+
+        _, first_fw = first.fw
+        _, second_fw = second.fw
+        _, third_fw = third.fw
+        assert first_fw.state['profiles'] is second_fw.state['profiles']
+        assert third_fw.state['profiles'] is not second_fw.state['profiles']
+
+        device.restore(first)
+        assert device.fw.profiles[0]['dpi'] == [800, 1600]
+
+    def test_array_state(self, device):
+        device.fw = ArrayFirmware(device)
+
+        first = device.snapshot()
+        second = device.snapshot()
+        device.fw.registers[0] = 1
+
+        device.restore(first)
+        assert not device.fw.registers.any()
+
+        device.restore(second)
+        assert not device.fw.registers.any()
+
+    def test_unhashable_component(self, device):
+        device.hw['data'] = DataComponent(level=1)
+
+        snap = device.snapshot()
+        device.snapshot()
+        device.hw['data'].level = 5
+
+        device.restore(snap)
+        assert device.hw['data'].level == 1
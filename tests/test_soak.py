@@ -0,0 +1,50 @@
+# SPDX-License-Identifier: MIT
+
+import itertools
+import random
+
+from ratbag_emu.soak import SoakRunner, _random_actions
+from ratbag_emu.util import ActionType, mm2inch
+
+from tests import TestBase
+
+
+class TestSoakRunner(TestBase):
+    def test_shards(self):
+        runner = SoakRunner(workers=3, devices=7)
+
+        shards = runner.shards()
+
+        assert len(shards) == 3
+        assert sorted(len(shard) for shard in shards) == [2, 2, 3]
+        names = [spec['name'] for shard in shards for spec in shard]
+        assert len(set(names)) == 7
+
+    def test_random_actions(self):
+        dpi = report_rate = 1000
+        axis_max = {'x': 2047, 'y': 127}
+
+        for action in itertools.islice(_random_actions(dpi, report_rate, axis_max, random.Random(0)), 100):
+            report_count = max(int(round(action['duration'] / 1000 * report_rate)), 1)
+            for attr, limit in axis_max.items():
+                assert abs(mm2inch(action['data'][attr]) * dpi) <= limit * report_count
+
+    def test_run(self):
+        script = [{
+            'type': ActionType.XY,
+            'duration': 100,
+            'data': {
+                'x': 1,
+                'y': 1
+            }
+        }]
+
+        runner = SoakRunner(workers=2, devices=2, report_rate=100, duration=1,
+                            script=script, interval=0.2)
+
+        summary = runner.run()
+
+        assert summary['devices'] == 2
+        assert summary['actions'] > 0
+        assert summary['reports'] > 0
+        assert summary['errors'] == 0